@@ -0,0 +1,270 @@
+import os
+import csv
+import time
+import argparse
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+# === CONFIG ===
+SITE_URL = "https://browser.geekbench.com"
+OUTPUT_DIR = r"E:\BenchSmart\Test Programs\Benchmark Scrape\Scraper Output"
+PLATFORMS = {
+    "android": {
+        "url": f"{SITE_URL}/android-benchmarks",
+        "tabs": {
+            "Single-Core Score": None,
+            "Multi-Core Score": "multicore",
+            "OpenCL Score": "opencl",
+            "Vulkan Score": "vulkan",
+        },
+        "max_pages": 10,
+        "output": "android_benchmarks.csv",
+    },
+    "ios": {
+        "url": f"{SITE_URL}/ios-benchmarks",
+        "tabs": {
+            "Single-Core Score": None,
+            "Multi-Core Score": "multicore",
+            "Metal Score": "metal",
+        },
+        "max_pages": 3,
+        "output": "ios_benchmarks.csv",
+    },
+}
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+WORKERS = 8               # pages fetched at once
+REQUESTS_PER_SECOND = 3   # per host, across all workers
+BURST = 3                 # requests allowed back to back after an idle spell
+TIMEOUT = 30              # seconds per request
+RETRIES = 3               # extra attempts for 429 / 5xx answers and connection errors
+BACKOFF = 1.0             # seconds before the first retry, doubled for each further one
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# ---- Rate limiting ----
+class TokenBucket:
+    """
+    `rate` requests per second on average, at most `burst` back to back.
+    acquire() blocks the calling thread until a request may go out.
+    """
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class HostRateLimiter:
+    """
+    One TokenBucket per host, created on first use.
+    """
+    def __init__(self, rate: float = REQUESTS_PER_SECOND, burst: int = BURST):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, url: str):
+        host = urlsplit(url).netloc
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(self.rate, self.burst)
+        bucket.acquire()
+
+def make_session(workers: int = WORKERS) -> requests.Session:
+    """
+    Session with a connection pool big enough for every worker. The adapter never
+    retries on its own: fetch_page retries through the rate limiter instead.
+    """
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=workers, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def retry_delay(response: requests.Response | None, attempt: int) -> float:
+    """
+    Seconds to wait before retry number `attempt` (1, 2, ...): the server's
+    Retry-After (seconds or HTTP date) if it sent one, else exponential backoff.
+    """
+    value = response.headers.get("Retry-After") if response is not None else None
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    return BACKOFF * 2 ** (attempt - 1)
+
+# ---- Pages ----
+def build_url(base_url: str, test: str | None, page: int) -> str:
+    params = ([f"test={test}"] if test else []) + ([f"page={page}"] if page > 1 else [])
+    return f"{base_url}?{'&'.join(params)}" if params else base_url
+
+def parse_page(html: str, score_type: str, score_types: list[str]) -> list[dict]:
+    """
+    One row per device on a results page; only `score_type` is filled in,
+    the other score columns are left blank.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    rows = []
+    for tr in soup.find_all("tr"):
+        name_td = tr.find("td", class_="name")
+        score_td = tr.find("td", class_="score")
+        if not (name_td and score_td):
+            continue
+        link = name_td.find("a")
+        if not link:
+            continue
+        chipset = name_td.find("div", class_="description")
+        row = {
+            "Device Name": link.text.strip(),
+            "Chipset": chipset.text.strip() if chipset else "",
+            "Device URL": SITE_URL + link["href"],
+        }
+        row.update({s: "" for s in score_types})
+        row[score_type] = score_td.text.strip()
+        rows.append(row)
+    return rows
+
+def fetch_page(session: requests.Session, url: str, score_type: str, score_types: list[str],
+               limiter: HostRateLimiter | None = None) -> tuple[list[dict] | None, str]:
+    """
+    (rows, note): rows is None when the page couldn't be fetched. 429 / 5xx answers
+    and connection errors are retried up to RETRIES times (see retry_delay); each
+    retry waits for `limiter` too, so retries stay within the configured rate.
+    The caller waits for the limiter before the first attempt.
+    """
+    for attempt in range(RETRIES + 1):
+        if attempt:
+            time.sleep(retry_delay(response, attempt))
+            if limiter is not None:
+                limiter.acquire(url)
+        response = None
+        try:
+            response = session.get(url, timeout=TIMEOUT)
+        except requests.RequestException as e:
+            note = f"{type(e).__name__}: {e}"
+            continue
+        if response.status_code in RETRY_STATUS:
+            note = f"HTTP {response.status_code}"
+            continue
+        if response.status_code != 200:
+            return None, f"HTTP {response.status_code}"
+        return parse_page(response.text, score_type, score_types), ""
+    return None, note
+
+# ---- Crawl ----
+def crawl(platforms: list[str], max_pages: int | None = None, workers: int = WORKERS,
+          rate: float = REQUESTS_PER_SECOND, burst: int = BURST) -> dict:
+    """
+    {platform: rows} for the given platforms, every (score tab x page) fetched
+    concurrently through one session and one per-host rate limiter. Rows come
+    out in the order the one-page-at-a-time scrape produced them: tab by tab,
+    page by page, and a tab ends at its first failed or empty page.
+    """
+    session = make_session(workers)
+    limiter = HostRateLimiter(rate, burst)
+    ends = {}  # (platform, score type) -> first page found failed or empty
+    lock = threading.Lock()
+
+    def fetch(tab: tuple, page: int, url: str, score_types: list[str]):
+        # pages past a tab's known end are skipped, before and after waiting for the limiter
+        if page > ends.get(tab, page):
+            return [], "past the last page"
+        limiter.acquire(url)
+        if page > ends.get(tab, page):
+            return [], "past the last page"
+        rows, note = fetch_page(session, url, tab[1], score_types, limiter)
+        if not rows:
+            with lock:
+                ends[tab] = min(ends.get(tab, page), page)
+        return rows, note
+
+    results = {}
+    with session, ThreadPoolExecutor(max_workers=workers) as pool:
+        # page 1 of every tab first, then page 2 ..., so short tabs are found out early
+        jobs = []
+        for platform in platforms:
+            config = PLATFORMS[platform]
+            for score_type, test in config["tabs"].items():
+                for page in range(1, (max_pages or config["max_pages"]) + 1):
+                    jobs.append((page, platform, score_type, build_url(config["url"], test, page)))
+        futures = {}
+        for page, platform, score_type, url in sorted(jobs, key=lambda job: job[0]):
+            futures.setdefault((platform, score_type), []).append(
+                pool.submit(fetch, (platform, score_type), page, url, list(PLATFORMS[platform]["tabs"])))
+
+        for platform in platforms:
+            rows = []
+            for score_type in PLATFORMS[platform]["tabs"]:
+                print(f"Scraping {platform} {score_type}...")
+                tab = futures[platform, score_type]
+                for page, future in enumerate(tab, start=1):
+                    page_rows, note = future.result()
+                    if page_rows is None:
+                        print(f"  Page {page}: [WARN] {note}")
+                    else:
+                        print(f"  Page {page}: {len(page_rows)} entries")
+                    if not page_rows:
+                        for later in tab[page:]:
+                            later.cancel()
+                        break
+                    rows.extend(page_rows)
+            results[platform] = rows
+    return results
+
+def write_csv(rows: list[dict], platform: str, path: str):
+    fieldnames = ["Device Name", "Chipset", "Device URL"] + list(PLATFORMS[platform]["tabs"])
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def scrape(platforms: list[str], output_dir: str = OUTPUT_DIR, **crawl_options):
+    start = time.perf_counter()
+    for platform, rows in crawl(platforms, **crawl_options).items():
+        path = os.path.join(output_dir, PLATFORMS[platform]["output"])
+        write_csv(rows, platform, path)
+        print(f"Scraping complete! Saved {len(rows)} rows to {path}")
+    print(f"[INFO] {', '.join(platforms)} crawled in {time.perf_counter() - start:.1f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape the Geekbench Browser benchmark charts to CSV.")
+    parser.add_argument("platforms", nargs="*", help=f"platforms to crawl: {', '.join(PLATFORMS)} (default: all)")
+    parser.add_argument("--pages", type=int, default=None, help="pages per score tab (default: per platform)")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="pages fetched at once")
+    parser.add_argument("--rate", type=float, default=REQUESTS_PER_SECOND, help="requests per second per host")
+    parser.add_argument("--burst", type=int, default=BURST, help="requests allowed back to back")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    args = parser.parse_args()
+    unknown = [p for p in args.platforms if p not in PLATFORMS]
+    if unknown:
+        parser.error(f"unknown platform(s): {', '.join(unknown)}")
+    scrape(args.platforms or list(PLATFORMS), args.output_dir, max_pages=args.pages, workers=args.workers,
+           rate=args.rate, burst=args.burst)
+
+if __name__ == "__main__":
+    main()
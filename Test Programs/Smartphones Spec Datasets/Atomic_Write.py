@@ -0,0 +1,19 @@
+import os
+from contextlib import contextmanager
+
+@contextmanager
+def atomic_path(path):
+    """
+    Yields a temp path next to `path` to write to; it is renamed over `path` when the
+    block finishes and removed when it raises, so readers never see a half-written file.
+    """
+    path = str(path)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
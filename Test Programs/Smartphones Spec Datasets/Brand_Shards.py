@@ -0,0 +1,207 @@
+import os
+import gzip
+import lzma
+import json
+import glob
+import argparse
+from pathlib import Path
+
+from Atomic_Write import atomic_path
+from Phone_Record import compact_phones, to_json
+
+# === CONFIG ===
+OUTPUT_DIR = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Dataset_JSON"  # brand files
+COMPACT_RATIO = 2.0       # rewrite a shard once it holds this many lines per live phone ...
+COMPACT_MIN_LINES = 1000  # ... and at least this many lines (small shards just keep appending)
+
+# Brand file formats: "json" is one pretty-printed document per brand (Merge_Kaggle_Datasets'
+# default); the jsonl formats hold one header line and then one line per phone write.
+FORMATS = {
+    "json": ".json",
+    "jsonl": ".jsonl",
+    "jsonl.gz": ".jsonl.gz",
+    "jsonl.xz": ".jsonl.xz",
+}
+
+def format_of(path) -> str | None:
+    name = str(path)
+    for fmt, suffix in sorted(FORMATS.items(), key=lambda item: -len(item[1])):
+        if name.endswith(suffix):
+            return fmt
+    return None
+
+def brand_files(output_dir: str = OUTPUT_DIR) -> list[str]:
+    """
+    Every brand file in `output_dir`, in any format, sorted by path.
+    """
+    paths = []
+    for suffix in FORMATS.values():
+        paths += glob.glob(os.path.join(output_dir, f"*{suffix}"))
+    return sorted(paths)
+
+# ---- Shard lines ----
+# A shard is read top to bottom and the last line of a phone id wins:
+#   {"brand": "Samsung"}                                        header (first line)
+#   {"id": ..., "brand": ..., "model": ..., "attributes": {...}} phone written / updated
+#   {"id": ..., "deleted": true}                                 phone removed
+def open_shard(path, mode: str, fmt: str | None = None):
+    fmt = fmt or format_of(path)
+    if fmt == "jsonl.gz":
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="\n")
+    if fmt == "jsonl.xz":
+        return lzma.open(path, mode + "t", encoding="utf-8", newline="\n")
+    return open(path, mode, encoding="utf-8", newline="\n")
+
+def phone_line(phone) -> str:
+    return json.dumps(phone, ensure_ascii=False, separators=(",", ":"), default=to_json)
+
+class ShardState:
+    """
+    What is on disk for one shard: its line count and a hash of every live phone's line,
+    so a save only appends the phones whose line changed.
+    """
+    __slots__ = ("lines", "hashes")
+
+    def __init__(self, lines: int = 0, hashes: dict | None = None):
+        self.lines = lines
+        self.hashes = {} if hashes is None else hashes
+
+_states = {}  # shard path -> ShardState of the brand db loaded from / written to it
+
+def forget_shards():
+    """
+    Drop every ShardState (the brand dbs were evicted; the next read rebuilds them).
+    """
+    _states.clear()
+
+def read_shard(path) -> dict:
+    """
+    Stream a shard into a brand db {"brand", "phones": id -> phone}. A torn last
+    line (interrupted append) is ignored, and the shard is left without a
+    ShardState so the next write_shard compacts it instead of appending after the tear.
+    """
+    brand, phones, hashes, lines, torn = None, {}, {}, 0, False
+    with open_shard(path, "r") as f:
+        try:
+            for line in f:
+                if not line.endswith("\n"):
+                    torn = True
+                line = line.rstrip("\n")
+                if not line:
+                    continue
+                try:
+                    obj = json.loads(line)
+                except ValueError:
+                    torn = True
+                    continue
+                lines += 1
+                if "id" not in obj:
+                    brand = brand or obj.get("brand")
+                elif obj.get("deleted"):
+                    phones.pop(obj["id"], None)
+                    hashes.pop(obj["id"], None)
+                else:
+                    phones[obj["id"]] = obj
+                    hashes[obj["id"]] = hash(line)
+        except EOFError:
+            torn = True  # compressed stream cut off mid-append
+    if torn:
+        _states.pop(str(path), None)
+    else:
+        _states[str(path)] = ShardState(lines, hashes)
+    return {"brand": brand, "phones": phones}
+
+def rewrite_shard(path, db: dict) -> int:
+    """
+    Compaction: write the header and one line per live phone to a temp file and
+    rename it over `path`. Returns the bytes on disk.
+    """
+    path = Path(path)
+    hashes = {}
+    with atomic_path(path) as tmp_path:
+        with open_shard(tmp_path, "w", format_of(path)) as f:
+            f.write(json.dumps({"brand": db["brand"]}, ensure_ascii=False) + "\n")
+            for phone_id, phone in db["phones"].items():
+                line = phone_line(phone)
+                hashes[phone_id] = hash(line)
+                f.write(line + "\n")
+    _states[str(path)] = ShardState(len(hashes) + 1, hashes)
+    return path.stat().st_size
+
+def write_shard(path, db: dict) -> int:
+    """
+    Append the phones that changed (and tombstones for removed ones) since the shard
+    was last read or written; rewrite it instead when it has none yet, was read with
+    a torn tail, or has grown past COMPACT_RATIO lines per phone. Returns the bytes
+    written to disk.
+    """
+    path = Path(path)
+    state = _states.get(str(path))
+    if state is None or not path.exists():
+        return rewrite_shard(path, db)
+
+    phones = db["phones"]
+    changed, hashes = [], {}
+    for phone_id, phone in phones.items():
+        line = phone_line(phone)
+        h = hashes[phone_id] = hash(line)
+        if state.hashes.get(phone_id) != h:
+            changed.append(line)
+    changed += [json.dumps({"id": phone_id, "deleted": True}) for phone_id in state.hashes if phone_id not in phones]
+    if not changed:
+        return 0
+
+    lines = state.lines + len(changed)
+    if lines >= COMPACT_MIN_LINES and lines > COMPACT_RATIO * (len(phones) + 1):
+        return rewrite_shard(path, db)
+    before = path.stat().st_size
+    with open_shard(path, "a") as f:
+        f.write("\n".join(changed) + "\n")
+    state.lines, state.hashes = lines, hashes
+    return path.stat().st_size - before
+
+# ---- Any brand file ----
+def read_brand_file(path) -> dict:
+    """
+    A brand db from a .json document or a shard; phones become PhoneRecords.
+    """
+    if format_of(path) == "json":
+        with open(path, "r", encoding="utf-8") as f:
+            db = json.load(f)
+    else:
+        db = read_shard(path)
+    compact_phones(db.get("phones", {}))
+    return db
+
+def convert_brand_files(output_dir: str, fmt: str) -> tuple[int, int]:
+    """
+    Rewrite every brand file in `output_dir` as a compacted file of format `fmt`
+    (also compacts shards already in it). Returns (bytes before, bytes after).
+    """
+    before = after = 0
+    for path in brand_files(output_dir):
+        before += os.path.getsize(path)
+        db = read_brand_file(path)
+        target = path[:-len(FORMATS[format_of(path)])] + FORMATS[fmt]
+        if fmt == "json":
+            with atomic_path(target) as tmp_path:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(db, f, ensure_ascii=False, indent=2, default=to_json)
+            after += os.path.getsize(target)
+        else:
+            after += rewrite_shard(target, db)
+        if target != path:
+            os.remove(path)
+    forget_shards()
+    return before, after
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert / compact the merged brand files.")
+    parser.add_argument("format", choices=list(FORMATS), help="target format")
+    parser.add_argument("--dir", default=OUTPUT_DIR, help="directory holding the brand files")
+    args = parser.parse_args()
+    before, after = convert_brand_files(args.dir, args.format)
+    print(f"Brand files in {args.dir}: {before / 2**20:.2f} MB -> {after / 2**20:.2f} MB ({args.format})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+from collections import deque, defaultdict
+
+# === CONFIG ===
+BUFFER_LINES = 4096      # ring buffer size; a full buffer is flushed by the caller
+FLUSH_INTERVAL = 0.5     # seconds between background flushes
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+# Level of a message that doesn't pass one explicitly, from its leading tag
+TAG_LEVELS = {"[DEBUG]": "DEBUG", "[WARN]": "WARNING", "[SKIP]": "WARNING", "[ERROR]": "ERROR"}
+
+def level_of(msg: str) -> str:
+    if msg.startswith("["):
+        return TAG_LEVELS.get(msg[:msg.find("]") + 1], "INFO")
+    return "INFO"
+
+class BufferedLogger:
+    """
+    Log lines go into an in-memory ring buffer; a background thread appends them
+    to `path` (and echoes them to stdout) in batches, so callers never wait on I/O.
+
+    Text lines are written as given; with json_lines=True every line is a JSON
+    object {"ts", "level", "msg", **fields}. count()/log_summary() keep per-scope
+    counters (e.g. rows per CSV) in memory and write them once at the end.
+    """
+    def __init__(self, path: str, level: str = "INFO", json_lines: bool = False, echo: bool = True,
+                 capacity: int = BUFFER_LINES, flush_interval: float = FLUSH_INTERVAL):
+        self.path = path
+        self.level = LEVELS[level]
+        self.json_lines = json_lines
+        self.echo = echo
+        self.capacity = capacity
+        self.counters = defaultdict(lambda: defaultdict(int))  # scope -> name -> value
+
+        self._buffer = deque()
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, args=(flush_interval,),
+                                        name="log-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ---- Writing ----
+    def log(self, msg: str, level: str | None = None, **fields):
+        level = level or level_of(msg)
+        if LEVELS[level] < self.level:
+            return
+        self._buffer.append((time.time(), level, msg.rstrip(), fields))
+        if len(self._buffer) >= self.capacity:
+            self.flush()
+
+    def _format(self, ts: float, level: str, msg: str, fields: dict) -> str:
+        if not self.json_lines:
+            return msg
+        stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(ts)) + f".{int(ts % 1 * 1000):03d}"
+        return json.dumps({"ts": stamp, "level": level, "msg": msg, **fields}, ensure_ascii=False, default=str)
+
+    def flush(self):
+        """
+        Write everything buffered so far with one write per target.
+        """
+        with self._write_lock:
+            if self._file is None:
+                return
+            lines = []
+            while self._buffer:
+                ts, level, msg, fields = self._buffer.popleft()
+                lines.append((msg, self._format(ts, level, msg, fields)))
+            if not lines:
+                return
+            self._file.write("".join(line + "\n" for _, line in lines))
+            self._file.flush()
+            if self.echo:
+                sys.stdout.write("".join(msg + "\n" for msg, _ in lines))
+                sys.stdout.flush()
+
+    def _run(self, interval: float):
+        while not self._stop.wait(interval):
+            self.flush()
+
+    def close(self):
+        if self._file is None:
+            return
+        self._stop.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        self.flush()
+        with self._write_lock:
+            self._file.close()
+            self._file = None
+        atexit.unregister(self.close)
+
+    # ---- Summary counters (no I/O until log_summary) ----
+    def count(self, scope: str, **deltas: int):
+        counters = self.counters[scope]
+        for name, delta in deltas.items():
+            counters[name] += delta
+
+    def log_summary(self, title: str = "summary", unit: str = "scopes"):
+        """
+        One DEBUG line per scope and an INFO line with the totals over all scopes.
+        """
+        totals = defaultdict(int)
+        for scope, counters in self.counters.items():
+            for name, value in counters.items():
+                totals[name] += value
+            text = ", ".join(f"{name}={value}" for name, value in counters.items())
+            self.log(f"[DEBUG] {title}: {scope} -> {text}", scope=scope, counters=dict(counters))
+        text = ", ".join(f"{name}={value}" for name, value in totals.items())
+        self.log(f"[INFO] {title}: {len(self.counters)} {unit} -> {text}", level="INFO",
+                 scopes=len(self.counters), counters=dict(totals))
@@ -0,0 +1,193 @@
+import os
+import json
+
+import pandas as pd
+
+from Atomic_Write import atomic_path
+from Brand_Shards import brand_files, read_brand_file
+from Unit_Normalization import NORMALIZED_KEYS, RULES, normalize_column
+
+# pyarrow is optional for the merge itself; it is imported where it is needed.
+
+# === CONFIG ===
+OUTPUT_DIR = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Dataset_JSON"  # brand files (.json or shards)
+CATALOG_FILE = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Dataset_JSON\Catalog\catalog.parquet"
+
+# ---- Reading the merged brand files ----
+def iter_catalog_phones(output_dir: str = OUTPUT_DIR):
+    """
+    Yield every phone object ({"id", "brand", "model", "attributes"}) of the merged catalog.
+    """
+    for path in brand_files(output_dir):
+        yield from read_brand_file(path).get("phones", {}).values()
+
+def is_number(v) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+# ---- Column building ----
+def numeric_array(values: list, list_type: bool = False):
+    """
+    int64 when every number is an int that fits, else float64 (optionally as list<...>).
+    """
+    import pyarrow as pa
+
+    nums = [x for v in values if v is not None for x in (v if list_type else [v])]
+    if all(isinstance(x, int) and -2**63 <= x < 2**63 for x in nums):
+        typ = pa.int64()
+    else:
+        typ = pa.float64()
+        if list_type:
+            values = [None if v is None else [float(x) for x in v] for v in values]
+        else:
+            values = [None if v is None else float(v) for v in values]
+    return pa.array(values, type=pa.list_(typ) if list_type else typ)
+
+def typed_columns(key: str, values: list, as_list: bool) -> dict:
+    """
+    Split one attribute into a numeric column `key` and, for values that are not
+    numbers, a string column `key_text`; a key without any numbers stays a string
+    column. list_fields become list columns (a scalar is a one-item list).
+    """
+    import pyarrow as pa
+
+    if as_list:
+        values = [None if v is None else (v if isinstance(v, list) else [v]) for v in values]
+        nums = [[x for x in v if is_number(x)] or None if v else None for v in values]
+        texts = [[str(x) for x in v if not is_number(x)] or None if v else None for v in values]
+        text_type = pa.list_(pa.string())
+    else:
+        nums = [v if is_number(v) else None for v in values]
+        texts = [None if v is None or is_number(v) else str(v) for v in values]
+        text_type = pa.string()
+
+    has_num = any(v is not None for v in nums)
+    has_text = any(v is not None for v in texts)
+    if not has_num:
+        return {key: pa.array(texts, type=text_type)}
+    columns = {key: numeric_array(nums, list_type=as_list)}
+    if has_text:
+        columns[f"{key}_text"] = pa.array(texts, type=text_type)
+    return columns
+
+def normalized_values(key: str, values: list, as_list: bool) -> list:
+    """
+    Run the string cells of a unit-normalized key through Unit_Normalization: parsed
+    cells become floats in the canonical unit, anything unparsed stays as it was
+    (-> `key_text`). Numbers were normalized by the merge and pass straight through.
+    """
+    rows = [None if v is None else (v if isinstance(v, list) else [v]) for v in values] if as_list else values
+    items = [x for v in rows if v is not None for x in (v if as_list else [v]) if isinstance(x, str)]
+    frame = normalize_column(key, pd.Series(items, dtype=object))
+    parsed = iter(item if v != v else v for v, item in zip(frame["value"].tolist(), items))
+    def cell(x):
+        return next(parsed) if isinstance(x, str) else x
+    if as_list:
+        return [None if v is None else [cell(x) for x in v] for v in rows]
+    return [None if v is None else cell(v) for v in rows]
+
+def unit_metadata(key: str) -> dict:
+    """
+    Field metadata of a unit-normalized column: its canonical unit and, when cells
+    keep their own unit (price), the column holding it.
+    """
+    rule = RULES[key]
+    if "unit_key" in rule:
+        return {"unit": rule["canonical"], "unit_column": rule["unit_key"]}
+    return {"unit": rule["canonical"]}
+
+def build_catalog_table(phones, canonical_keys, list_fields):
+    """
+    One row per phone: id/brand/model, typed columns per canonical key (see
+    typed_columns) and every other (attr_*) attribute as a JSON string in `extra`.
+    Unit-normalized keys are float columns whose field metadata holds the unit
+    (price: the default currency plus "unit_column": "price_currency").
+    """
+    import pyarrow as pa
+
+    canonical = [k for k in canonical_keys if k not in ("brand", "model")]
+    # per-cell units kept next to a value (price_currency) are columns too
+    canonical += [RULES[k]["unit_key"] for k in canonical if "unit_key" in RULES.get(k, {})]
+    known = set(canonical)
+    ids, brands, models, extra = [], [], [], []
+    columns = {k: [] for k in canonical}
+    for phone in phones:
+        attrs = phone.get("attributes", {})
+        ids.append(phone["id"])
+        brands.append(phone["brand"])
+        models.append(phone["model"])
+        for k in canonical:
+            columns[k].append(attrs.get(k))
+        rest = {k: v for k, v in attrs.items() if k not in known}
+        extra.append(json.dumps(rest, ensure_ascii=False) if rest else None)
+
+    arrays = {
+        "id": pa.array(ids, type=pa.string()),
+        "brand": pa.array(brands, type=pa.string()),
+        "model": pa.array(models, type=pa.string()),
+    }
+    normalized = set()
+    for k in canonical:
+        values = columns[k]
+        if k in NORMALIZED_KEYS:
+            values = normalized_values(k, values, as_list=k in list_fields)
+            normalized.add(k)
+        arrays.update(typed_columns(k, values, as_list=k in list_fields))
+    arrays["extra"] = pa.array(extra, type=pa.string())
+    schema = pa.schema([
+        pa.field(name, arr.type, metadata=unit_metadata(name) if name in normalized else None)
+        for name, arr in arrays.items()
+    ])
+    return pa.Table.from_arrays(list(arrays.values()), schema=schema)
+
+# ---- Writing / reading the catalog ----
+def write_catalog(table, catalog_path: str = CATALOG_FILE):
+    """
+    .parquet -> Parquet (zstd), .arrow/.feather -> Arrow IPC file. Written atomically.
+    """
+    import pyarrow.parquet as pq
+    import pyarrow.feather as feather
+
+    with atomic_path(catalog_path) as tmp_path:
+        if catalog_path.endswith((".arrow", ".feather")):
+            feather.write_feather(table, tmp_path, compression="zstd")
+        else:
+            pq.write_table(table, tmp_path, compression="zstd")
+
+def export_catalog(output_dir: str, catalog_path: str, canonical_keys, list_fields, phones=None) -> int:
+    """
+    Build the columnar catalog from the brand files (or the given phones, e.g. from
+    Sqlite_Store). Returns the number of phones.
+    """
+    if phones is None:
+        phones = iter_catalog_phones(output_dir)
+    table = build_catalog_table(phones, canonical_keys, list_fields)
+    write_catalog(table, catalog_path)
+    return table.num_rows
+
+def catalog_columns(catalog_path: str = CATALOG_FILE) -> list[str]:
+    """
+    Column names of the catalog, read from its schema only.
+    """
+    if catalog_path.endswith((".arrow", ".feather")):
+        import pyarrow.ipc as ipc
+        with ipc.open_file(catalog_path) as reader:
+            return reader.schema.names
+    import pyarrow.parquet as pq
+    return pq.read_schema(catalog_path).names
+
+def load_catalog(catalog_path: str = CATALOG_FILE, columns: list[str] | None = None, filters=None):
+    """
+    Read the catalog as a pyarrow Table; only the requested columns are decoded.
+    `filters` is pushed down to Parquet, e.g. [("battery_capacity", ">=", 5000)].
+    """
+    if catalog_path.endswith((".arrow", ".feather")):
+        import pyarrow.feather as feather
+        return feather.read_table(catalog_path, columns=columns, memory_map=True)
+    import pyarrow.parquet as pq
+    return pq.read_table(catalog_path, columns=columns, filters=filters)
+
+if __name__ == "__main__":
+    from Merge_Kaggle_Datasets import CANONICAL_KEYS, LIST_FIELDS
+
+    n = export_catalog(OUTPUT_DIR, CATALOG_FILE, CANONICAL_KEYS, LIST_FIELDS)
+    print(f"Catalog with {n} phones written to: {CATALOG_FILE}")
@@ -0,0 +1,265 @@
+import re
+import json
+import time
+import argparse
+
+import numpy as np
+
+from Catalog_Export import CATALOG_FILE, load_catalog
+
+# pyarrow is needed to read the catalog; it is imported where it is needed.
+
+OPERATORS = ("==", "!=", "<", "<=", ">", ">=", "between", "in")
+NUMBER_RE = re.compile(r"^\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*$")
+
+# ---- Indexes ----
+class SortedIndex:
+    """
+    (value, row) pairs sorted by value; a range is two binary searches and a slice.
+    List columns (ram, price, colors ...) have one pair per item, so a phone
+    matches when any of its values does.
+    """
+    __slots__ = ("values", "rows")
+
+    def __init__(self, values: np.ndarray, rows: np.ndarray):
+        order = np.argsort(values, kind="stable")
+        self.values = values[order]
+        self.rows = rows[order]
+
+    def range_rows(self, lo=None, hi=None, lo_inclusive: bool = True, hi_inclusive: bool = True) -> np.ndarray:
+        start = 0 if lo is None else np.searchsorted(self.values, lo, "left" if lo_inclusive else "right")
+        stop = len(self.values) if hi is None else np.searchsorted(self.values, hi, "right" if hi_inclusive else "left")
+        return self.rows[start:stop]
+
+class Column:
+    """
+    One catalog column as NumPy arrays: numeric values (float64) or strings
+    dictionary-encoded to int codes (compared case-insensitively). The sorted
+    index and the per-row sort keys are built on first use.
+    """
+    def __init__(self, name: str, values: np.ndarray, rows: np.ndarray, n_rows: int,
+                 categories: dict | None = None):
+        self.name = name
+        self.values = values        # flattened values (one per item for list columns)
+        self.rows = rows            # row of every value
+        self.n_rows = n_rows
+        self.categories = categories  # lowercased text -> code, None for numeric columns
+        self._index = None
+        self._sort_keys = {}
+
+    @property
+    def numeric(self) -> bool:
+        return self.categories is None
+
+    @property
+    def index(self) -> SortedIndex:
+        if self._index is None:
+            self._index = SortedIndex(self.values, self.rows)
+        return self._index
+
+    def code(self, value):
+        # unknown text gets a code no row has
+        return self.categories.get(str(value).strip().lower(), -1)
+
+    def sort_key(self, descending: bool) -> np.ndarray:
+        """
+        Per-row key: the smallest value ascending, the largest descending (a list
+        column sorts by its cheapest / best variant); rows without a value get NaN.
+        """
+        key = self._sort_keys.get(descending)
+        if key is None:
+            key = np.full(self.n_rows, -np.inf if descending else np.inf)
+            (np.maximum if descending else np.minimum).at(key, self.rows, self.values.astype(float))
+            key[np.isinf(key)] = np.nan
+            self._sort_keys[descending] = key
+        return key
+
+def arrow_column(name: str, chunked, n_rows: int) -> Column | None:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    arr = chunked.combine_chunks() if chunked.num_chunks != 1 else chunked.chunk(0)
+    if pa.types.is_list(arr.type) or pa.types.is_large_list(arr.type):
+        rows = pc.list_parent_indices(arr).to_numpy()
+        arr = pc.list_flatten(arr)
+    else:
+        rows = np.arange(n_rows)
+    valid = arr.is_valid().to_numpy(zero_copy_only=False)
+    rows = rows[valid]
+    if pa.types.is_integer(arr.type) or pa.types.is_floating(arr.type):
+        values = arr.filter(arr.is_valid()).to_numpy().astype(float)
+        return Column(name, values, rows, n_rows)
+    if pa.types.is_string(arr.type) or pa.types.is_large_string(arr.type):
+        text = pc.utf8_lower(pc.utf8_trim_whitespace(arr.filter(arr.is_valid())))
+        names, codes = np.unique(np.asarray(text.to_pylist(), dtype=object), return_inverse=True)
+        return Column(name, codes.astype(np.int64), rows, n_rows, {v: i for i, v in enumerate(names)})
+    return None
+
+def number(name: str, op: str, value) -> float:
+    """
+    `value` as a float for a predicate on numeric column `name`.
+    """
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    if isinstance(value, str) and NUMBER_RE.match(value):
+        return float(value)
+    raise ValueError(f"{name} {op} {value!r}: {name} holds numbers and has no {name}_text column")
+
+# ---- Engine ----
+class CatalogEngine:
+    """
+    The merged catalog held as NumPy column arrays, queried with predicates like
+    load_catalog's filters: [("ram", ">=", 8), ("price", "between", (15000, 25000))].
+    A numeric column with a `<key>_text` sibling (os / os_text ...) answers text
+    values from the sibling.
+    """
+    def __init__(self, table):
+        self.table = table
+        self.n_rows = table.num_rows
+        self.names = set(table.column_names)
+        self.units = {f.name: f.metadata[b"unit"].decode() for f in table.schema
+                      if f.metadata and b"unit" in f.metadata}
+        self._columns = {}
+
+    @classmethod
+    def load(cls, catalog_path: str = CATALOG_FILE) -> "CatalogEngine":
+        return cls(load_catalog(catalog_path))
+
+    def column(self, name: str) -> Column:
+        col = self._columns.get(name)
+        if col is None:
+            if name not in self.names or name == "extra":
+                raise KeyError(f"unknown catalog column: {name}")
+            col = arrow_column(name, self.table.column(name), self.n_rows)
+            if col is None:
+                raise KeyError(f"catalog column {name} can't be queried")
+            self._columns[name] = col
+        return col
+
+    def _resolve(self, name: str, value) -> Column:
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        if any(isinstance(v, str) for v in values) and f"{name}_text" in self.names:
+            col = self.column(name)
+            if col.numeric:
+                return self.column(f"{name}_text")
+        return self.column(name)
+
+    def _rows(self, name: str, op: str, value) -> np.ndarray:
+        """
+        Rows (possibly repeated) matching one predicate, except != (see _mask).
+        """
+        if op not in OPERATORS:
+            raise ValueError(f"unknown operator {op!r} (use one of {', '.join(OPERATORS)})")
+        col = self._resolve(name, value)
+        if col.numeric:
+            key = lambda v: number(name, op, v)
+        elif op in ("==", "!=", "in"):
+            key = col.code
+        else:
+            raise ValueError(f"{op} needs a numeric column, {name} holds text")
+        if op == "in":
+            keys = [key(v) for v in value]
+            parts = [col.index.range_rows(v, v) for v in keys]
+            return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+        if op == "between":
+            lo, hi = map(key, value)
+            return col.index.range_rows(lo, hi)
+        v = key(value)
+        if op in ("==", "!="):
+            return col.index.range_rows(v, v)
+        if op in ("<", "<="):
+            return col.index.range_rows(hi=v, hi_inclusive=op == "<=")
+        return col.index.range_rows(lo=v, lo_inclusive=op == ">=")
+
+    def _mask(self, name: str, op: str, value) -> np.ndarray:
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self._rows(name, op, value)] = True
+        if op == "!=":
+            # rows that have a value and none of their values equals `value`
+            has = np.zeros(self.n_rows, dtype=bool)
+            has[self._resolve(name, value).rows] = True
+            mask = has & ~mask
+        return mask
+
+    def query(self, where=(), order_by: str | None = None, descending: bool = False,
+              limit: int | None = None) -> np.ndarray:
+        """
+        Row numbers of the phones matching every predicate, sorted by `order_by`
+        (rows without a value last) and cut to the top `limit`.
+        """
+        mask = None
+        for name, op, value in where:
+            m = self._mask(name, op, value)
+            mask = m if mask is None else mask & m
+        rows = np.arange(self.n_rows) if mask is None else np.flatnonzero(mask)
+        if order_by is None:
+            return rows if limit is None else rows[:limit]
+
+        key = self.column(order_by).sort_key(descending)[rows]
+        key = np.where(np.isnan(key), np.inf, -key if descending else key)
+        if limit is not None and limit < len(rows):
+            top = np.argpartition(key, limit - 1)[:limit]
+            rows, key = rows[top], key[top]
+        return rows[np.lexsort((rows, key))]
+
+    def select(self, where=(), order_by: str | None = None, descending: bool = False,
+               limit: int | None = None, columns: list[str] | None = None) -> list[dict]:
+        """
+        query() as plain dicts ({"id", "brand", "model", ...columns}).
+        """
+        return self.take(self.query(where, order_by, descending, limit), columns)
+
+    def take(self, rows: np.ndarray, columns: list[str] | None = None) -> list[dict]:
+        """
+        The given rows (from query()) as plain dicts, in that order.
+        """
+        names = ["id", "brand", "model"] + [c for c in (columns or []) if c not in ("id", "brand", "model")]
+        return self.table.select(names).take(rows).to_pylist()
+
+# ---- Command line ----
+PREDICATE_RE = re.compile(r"^\s*(\w+)\s*(==|!=|<=|>=|<|>|=)\s*(.+?)\s*$")
+
+def parse_value(text: str):
+    try:
+        return float(text) if any(ch in text for ch in ".eE") else int(text)
+    except ValueError:
+        return text
+
+def parse_predicate(text: str) -> tuple:
+    """
+    'ram>=8', 'price=15000..25000' (between), 'brand=Samsung', 'os!=ios'
+    """
+    m = PREDICATE_RE.match(text)
+    if not m:
+        raise argparse.ArgumentTypeError(f"can't parse predicate: {text}")
+    name, op, value = m.groups()
+    if op == "=" and ".." in value:
+        lo, hi = value.split("..", 1)
+        return name, "between", (parse_value(lo), parse_value(hi))
+    return name, "==" if op == "=" else op, parse_value(value)
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the columnar phone catalog.")
+    parser.add_argument("where", nargs="*", type=parse_predicate,
+                        help="predicates, e.g. ram>=8 price=15000..25000 battery_capacity>=5000")
+    parser.add_argument("--catalog", default=CATALOG_FILE)
+    parser.add_argument("--sort", default=None, help="column to sort by")
+    parser.add_argument("--desc", action="store_true", help="sort descending")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    t = time.perf_counter()
+    engine = CatalogEngine.load(args.catalog)
+    loaded = time.perf_counter() - t
+    order_by, descending = args.sort, args.desc
+    columns = [engine._resolve(name, value).name for name, _, value in args.where] + ([order_by] if order_by else [])
+
+    t = time.perf_counter()
+    rows = engine.query(args.where, order_by, descending)
+    took = time.perf_counter() - t  # includes building the indexes these columns hadn't needed yet
+    for row in engine.take(rows[:args.limit], columns):
+        print(json.dumps(row, ensure_ascii=False))
+    print(f"{len(rows)} of {engine.n_rows} phones match ({took * 1000:.2f} ms; catalog loaded in {loaded * 1000:.0f} ms)")
+
+if __name__ == "__main__":
+    main()
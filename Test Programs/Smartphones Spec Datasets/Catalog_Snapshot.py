@@ -0,0 +1,148 @@
+import os
+import json
+import glob
+import hashlib
+import argparse
+from datetime import datetime
+
+from Atomic_Write import atomic_path
+from Phone_Record import to_json
+
+# === CONFIG ===
+OUTPUT_DIR = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Dataset_JSON"  # brand files (.json or shards)
+SNAPSHOT_DIR = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Dataset_JSON\Snapshots"
+KEEP_SNAPSHOTS = 20  # older snapshots (and their change lists) are deleted
+
+# A snapshot is a text file, one "id<TAB>content hash" line per phone, sorted by id:
+#   # snapshot phones=11019 created=2024-05-01T10:00:00
+#   0003c5d4-...\t9f1c...
+# Each merge run writes snapshot-<time>.tsv and, when there is an earlier snapshot,
+# snapshot-<time>.changes.json with the ids added / removed / changed since it.
+SNAPSHOT_GLOB = "snapshot-*.tsv"
+
+# ---- Hashing ----
+def record_hash(phone) -> str:
+    """
+    Content hash of one phone (brand, model and attributes; key order doesn't matter).
+    """
+    text = json.dumps(phone, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=to_json)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+def snapshot_phones(phones) -> dict:
+    """
+    {phone id: content hash} over any iterable of phones (PhoneRecords or dicts).
+    An id found in several brand files (brand spellings that map to different files)
+    gets one hash over all its records.
+    """
+    hashes, repeated = {}, {}
+    for phone in phones:
+        phone_id = phone["id"]
+        h = record_hash(phone)
+        if phone_id in hashes:
+            repeated.setdefault(phone_id, [hashes[phone_id]]).append(h)
+        hashes[phone_id] = h
+    for phone_id, parts in repeated.items():
+        hashes[phone_id] = hashlib.blake2b("".join(sorted(parts)).encode("ascii"), digest_size=16).hexdigest()
+    return hashes
+
+# ---- Files ----
+def atomic_write_text(path: str, text: str):
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(text)
+
+def list_snapshots(snapshot_dir: str = SNAPSHOT_DIR) -> list[str]:
+    """
+    Snapshot paths, oldest first (names sort by creation time).
+    """
+    return sorted(glob.glob(os.path.join(snapshot_dir, SNAPSHOT_GLOB)))
+
+def changes_path(snapshot_path: str) -> str:
+    return snapshot_path[:-len(".tsv")] + ".changes.json"
+
+def read_snapshot(path: str) -> dict:
+    hashes = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#"):
+                continue
+            phone_id, _, h = line.rstrip("\n").partition("\t")
+            if h:
+                hashes[phone_id] = h
+    return hashes
+
+def write_snapshot(hashes: dict, snapshot_dir: str = SNAPSHOT_DIR) -> str:
+    """
+    Write a new snapshot file and return its path.
+    """
+    now = datetime.now()
+    path = os.path.join(snapshot_dir, f"snapshot-{now:%Y%m%d-%H%M%S-%f}.tsv")
+    lines = [f"# snapshot phones={len(hashes)} created={now:%Y-%m-%dT%H:%M:%S}"]
+    lines += [f"{phone_id}\t{hashes[phone_id]}" for phone_id in sorted(hashes)]
+    atomic_write_text(path, "\n".join(lines) + "\n")
+    return path
+
+def prune_snapshots(snapshot_dir: str = SNAPSHOT_DIR, keep: int = KEEP_SNAPSHOTS):
+    for path in list_snapshots(snapshot_dir)[:-keep] if keep > 0 else []:
+        os.remove(path)
+        if os.path.exists(changes_path(path)):
+            os.remove(changes_path(path))
+
+# ---- Diffing ----
+def diff_snapshots(old: dict, new: dict) -> dict:
+    """
+    {"added", "removed", "changed"} phone ids (sorted) between two snapshots;
+    one pass over each.
+    """
+    added, changed = [], []
+    for phone_id, h in new.items():
+        before = old.get(phone_id)
+        if before is None:
+            added.append(phone_id)
+        elif before != h:
+            changed.append(phone_id)
+    removed = [phone_id for phone_id in old if phone_id not in new]
+    return {"added": sorted(added), "removed": sorted(removed), "changed": sorted(changed)}
+
+def take_snapshot(phones, snapshot_dir: str = SNAPSHOT_DIR, keep: int = KEEP_SNAPSHOTS) -> tuple[str, dict | None]:
+    """
+    Snapshot `phones`, write the change list against the previous snapshot next
+    to it, prune old ones. Returns (snapshot path, changes or None for the first one).
+    """
+    previous = list_snapshots(snapshot_dir)
+    hashes = snapshot_phones(phones)
+    path = write_snapshot(hashes, snapshot_dir)
+    changes = None
+    if previous:
+        changes = {"previous": os.path.basename(previous[-1]), "snapshot": os.path.basename(path)}
+        changes.update(diff_snapshots(read_snapshot(previous[-1]), hashes))
+        atomic_write_text(changes_path(path), json.dumps(changes, ensure_ascii=False, indent=2) + "\n")
+    prune_snapshots(snapshot_dir, keep)
+    return path, changes
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot the merged catalog or diff two snapshots.")
+    parser.add_argument("snapshots", nargs="*", help="old and new snapshot files (default: the two latest)")
+    parser.add_argument("--dir", default=SNAPSHOT_DIR, help="snapshot directory")
+    parser.add_argument("--take", action="store_true", help="snapshot the brand files in --brands now")
+    parser.add_argument("--brands", default=OUTPUT_DIR, help="directory holding the brand files (with --take)")
+    parser.add_argument("--ids", action="store_true", help="print the changed ids, not just the counts")
+    args = parser.parse_args()
+
+    if args.take:
+        from Catalog_Export import iter_catalog_phones
+
+        path, _ = take_snapshot(iter_catalog_phones(args.brands), args.dir)
+        print(f"Snapshot written: {path}")
+        return
+    paths = args.snapshots or list_snapshots(args.dir)[-2:]
+    if len(paths) != 2:
+        parser.error("need two snapshots to diff")
+    changes = diff_snapshots(read_snapshot(paths[0]), read_snapshot(paths[1]))
+    if args.ids:
+        print(json.dumps(changes, ensure_ascii=False, indent=2))
+    print(f"{os.path.basename(paths[0])} -> {os.path.basename(paths[1])}: "
+          + ", ".join(f"{len(ids)} {kind}" for kind, ids in changes.items()))
+
+if __name__ == "__main__":
+    main()
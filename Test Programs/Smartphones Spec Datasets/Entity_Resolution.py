@@ -0,0 +1,193 @@
+import re
+from pathlib import Path
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+from Merge_Kaggle_Datasets import ALIAS_TABLE, OUTPUT_DIR, atomic_write_json, load_alias_table, log
+from Catalog_Export import iter_catalog_phones
+
+# === CONFIG ===
+MAX_BLOCK_SIZE = 200     # blocks larger than this are too generic to compare pairwise
+FUZZY_THRESHOLD = 0.85   # SequenceMatcher ratio between two differing words
+MIN_FUZZY_WORD = 4       # shorter words (ii/iii, x/xr, s/e) never match fuzzily
+
+# Tokens that describe a variant/listing rather than a different phone
+NOISE_TOKENS = {
+    "5g", "lte", "volte", "nfc", "dual", "sim", "ram", "rom", "storage",
+    "with", "and", "edition", "smartphone", "mobile", "phone", "gen", "generation",
+}
+MEMORY_TOKEN = re.compile(r"^\d+(?:gb|tb|mb)$")
+
+# Qualifiers that name a different phone, so they are kept even inside parentheses:
+# release years ('Galaxy A5 (2016)'), generations ('Moto G (3rd Gen)'), screen sizes
+# ('IDOL 3 (4.7")', 'Pixi 4 (4)' -> '4.7in', '4in'), 3G/4G models ('POP Star (4G)')
+# and RAM/storage pairs ('AGM A9 4/64GB' -> '4/64gb')
+RELEASE_RE = re.compile(r"\b(?:19|20)\d{2}\b|\b\d+(?:st|nd|rd|th)\b")
+SIZE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:\"|''|\u201d|\u2033|-?\s*inch(?:es)?\b|in\b)")
+BARE_SIZE_RE = re.compile(r"^\s*(\d{1,2}(?:\.\d+)?)\s*$")  # a group holding just a (non-year) number
+SIZE_TOKEN = r"\d+(?:\.\d+)?in\b"
+NETWORK_TOKEN = r"\b[34]g\b"
+MEMORY_PAIR = r"\b\d+\s*/\s*\d+\s*(?:gb|tb)\b"
+QUALIFIER_RE = re.compile(rf"{RELEASE_RE.pattern}|{SIZE_TOKEN}|{NETWORK_TOKEN}|{MEMORY_PAIR}")
+GROUP_RE = re.compile(r"\(([^)]*)\)|\[([^\]]*)\]")
+TOKEN_RE = re.compile(rf"{SIZE_TOKEN}|{MEMORY_PAIR}|[a-z0-9]+")
+
+# ---- Name normalization ----
+def kept_qualifiers(group: re.Match) -> str:
+    """
+    Year, size, 3G/4G and RAM/storage pair qualifiers of one parenthesized/bracketed
+    group; lone memory sizes, colour and other listing details are dropped.
+    """
+    inner = group.group(1) or group.group(2) or ""
+    inner = BARE_SIZE_RE.sub(r"\1in", inner)
+    inner = SIZE_RE.sub(r" \1in ", inner)
+    return f" {' '.join(QUALIFIER_RE.findall(inner))} "
+
+def core_tokens(model: str) -> list[str]:
+    """
+    'Galaxy S21 5G (8GB RAM, 128GB)' -> ['galaxy', 's21']
+    'Galaxy A5 (2016)' -> ['galaxy', 'a5', '2016'], 'IDOL 3 (4.7")' -> ['idol', '3', '4.7in']
+    'AGM A9 4/64GB' -> ['agm', 'a9', '4/64gb']
+    Parenthesized/bracketed specs, lone memory sizes and network words are dropped, but
+    years, screen sizes, 3G/4G and RAM/storage pairs stay as model-number tokens that must match;
+    '+' is kept as a word so 'S21+' stays different from 'S21'.
+    """
+    text = str(model).lower()
+    text = GROUP_RE.sub(kept_qualifiers, text)
+    text = SIZE_RE.sub(r" \1in ", text)
+    text = text.replace("+", " plus ")
+    tokens = [re.sub(r"\s+", "", t) for t in TOKEN_RE.findall(text)]
+    return [t for t in tokens if t not in NOISE_TOKENS and not MEMORY_TOKEN.match(t)]
+
+def digit_tokens(tokens: list[str]) -> frozenset:
+    return frozenset(t for t in tokens if any(ch.isdigit() for ch in t))
+
+def blocking_keys(brand: str, tokens: list[str]) -> list[tuple]:
+    """
+    Phones are only compared inside a block: same brand and a shared model-number
+    token (e.g. 's21'); names without digits block on their first token.
+    """
+    b = brand.strip().lower()
+    numbers = sorted(digit_tokens(tokens))
+    if numbers:
+        return [(b, t) for t in numbers]
+    return [(b, tokens[0])] if tokens else []
+
+# ---- Scoring ----
+def same_phone(a: dict, b: dict) -> bool:
+    """
+    Equal model numbers and either the same compacted core name ('Galaxy S21' ~
+    'GalaxyS21') or word-level typos only ('Galxy S21'). Short words must match
+    exactly, so 'Xperia 1 II' / 'Xperia 1 III' and 'iPhone X' / 'iPhone XR' stay apart.
+    """
+    if a["numbers"] != b["numbers"]:
+        return False
+    if a["compact"] == b["compact"]:
+        return True
+    if len(a["tokens"]) != len(b["tokens"]):
+        return False
+    for x, y in zip(a["tokens"], b["tokens"]):
+        if x == y:
+            continue
+        if not (x.isalpha() and y.isalpha() and min(len(x), len(y)) >= MIN_FUZZY_WORD):
+            return False
+        if SequenceMatcher(None, x, y).ratio() < FUZZY_THRESHOLD:
+            return False
+    return True
+
+# ---- Resolution ----
+def with_previous_aliases(phones, previous: dict):
+    """
+    The catalog phones, then every alias id of an earlier table that is not in the
+    catalog (the merge folded its record away) as a raw phone named by the table.
+    """
+    seen = set()
+    for phone in phones:
+        seen.add(phone["id"])
+        yield phone
+    for alias_id, alias in previous.items():
+        if alias_id not in seen:
+            seen.add(alias_id)
+            yield {"id": alias_id, "brand": alias["alias_brand"], "model": alias["alias_model"]}
+
+def resolve_entities(phones, previous: dict | None = None) -> dict:
+    """
+    Cluster near-duplicate phones of the same brand and return the alias table:
+    {alias_id: {"id": canonical_id, "brand", "model": canonical model, "alias_brand", "alias_model"}}.
+    The first phone seen in a cluster is its canonical record. Alias ids of the
+    `previous` table are resolved after the catalog phones, so a folded catalog
+    yields the same table again instead of losing its aliases.
+    """
+    entries = []
+    exact = {}          # (brand, compact core) -> first entry index
+    parent = []
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            # keep the earliest phone as root so the canonical record is stable
+            parent[max(ri, rj)] = min(ri, rj)
+
+    blocks = defaultdict(list)
+    for phone in with_previous_aliases(phones, previous or {}):
+        tokens = core_tokens(phone["model"])
+        if not tokens:
+            continue
+        i = len(entries)
+        entry = {
+            "id": phone["id"], "brand": phone["brand"], "model": phone["model"],
+            "numbers": digit_tokens(tokens), "compact": "".join(tokens), "tokens": tokens,
+        }
+        entries.append(entry)
+        parent.append(i)
+
+        # identical normalized names merge by hashing alone
+        key = (phone["brand"].strip().lower(), entry["compact"])
+        if key in exact:
+            union(exact[key], i)
+            continue
+        exact[key] = i
+        for block in blocking_keys(phone["brand"], tokens):
+            blocks[block].append(i)
+
+    # pairwise scoring only within (small) blocks
+    for members in blocks.values():
+        if len(members) < 2 or len(members) > MAX_BLOCK_SIZE:
+            continue
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                i, j = members[x], members[y]
+                if find(i) != find(j) and same_phone(entries[i], entries[j]):
+                    union(i, j)
+
+    table = {}
+    for i, entry in enumerate(entries):
+        root = entries[find(i)]
+        if root["id"] != entry["id"]:
+            table[entry["id"]] = {
+                "id": root["id"], "brand": root["brand"],
+                "model": root["model"], "alias_brand": entry["brand"], "alias_model": entry["model"],
+            }
+    return table
+
+def save_alias_table(table: dict, path: str = ALIAS_TABLE):
+    atomic_write_json(Path(path), {"aliases": table})
+
+def main():
+    """
+    Resolve the current merged catalog (plus the aliases already folded into it);
+    the next merge run folds aliases into their canonical ids.
+    """
+    phones = list(iter_catalog_phones(OUTPUT_DIR))
+    table = resolve_entities(phones, load_alias_table())
+    save_alias_table(table)
+    log(f"[OK] entity resolution -> {len(table)} aliases over {len(phones)} phones written to {ALIAS_TABLE}")
+
+if __name__ == "__main__":
+    main()
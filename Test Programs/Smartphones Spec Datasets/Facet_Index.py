@@ -0,0 +1,244 @@
+import re
+import json
+import time
+import argparse
+
+import numpy as np
+
+from Catalog_Export import CATALOG_FILE, catalog_columns, load_catalog
+
+# ---- Facet values ----
+# Family keywords, first match wins (searched in the lowercased text).
+OS_FAMILIES = [
+    ("android", ("android",)),
+    ("ios", ("ios",)),
+    ("harmonyos", ("harmony", "hongmeng")),
+    ("windows", ("windows",)),
+    ("blackberry", ("blackberry",)),
+    ("symbian", ("symbian",)),
+    ("tizen", ("tizen",)),
+    ("kaios", ("kai",)),
+]
+CHIPSET_FAMILIES = [
+    ("snapdragon", ("snapdragon", "sanpdragon", "qualcomm")),
+    ("dimensity", ("dimensity",)),
+    ("helio", ("helio",)),
+    ("mediatek", ("mediatek", "mtk")),
+    ("exynos", ("exynos", "samsung")),
+    ("kirin", ("kirin", "hisilicon", "hi-silicon", "huawei")),
+    ("unisoc", ("unisoc", "spreadtrum", "tiger", "sc98", "sc65")),
+    ("apple", ("apple", "bionic")),
+    ("tensor", ("tensor", "google")),
+]
+
+def family(text, families) -> str | None:
+    if not text or not str(text).strip():
+        return None
+    text = str(text).lower()
+    for name, keywords in families:
+        if any(k in text for k in keywords):
+            return name
+    return "other"
+
+def has_token(token: str, *texts) -> str | None:
+    # "yes" when any text mentions the token; phones that don't are simply not in the facet
+    pattern = re.compile(rf"(?<![a-z0-9]){token}(?![a-z0-9])")
+    return "yes" if any(t and pattern.search(str(t).lower()) for t in texts) else None
+
+def extra_flag(extra, key: str) -> str | None:
+    """
+    "yes" / "no" from a boolean-ish attribute kept in the catalog's `extra` JSON
+    (e.g. "attr_has 5g": true / "No"); None when the phone doesn't have it.
+    """
+    if not extra or key not in extra:
+        return None
+    value = json.loads(extra).get(key)
+    if value is None:
+        return None
+    return "yes" if str(value).strip().lower() in ("yes", "true", "1", "y") else "no"
+
+def text_cell(r: dict, key: str):
+    """
+    A text attribute of a catalog row: `key` when it is a string column, else the
+    `key_text` split of a mixed column (see Catalog_Export.typed_columns), else
+    the number itself.
+    """
+    value = r.get(key)
+    if isinstance(value, str):
+        return value
+    return r.get(f"{key}_text") or value
+
+# facet -> (catalog columns it reads, row dict -> value or None)
+FACETS = {
+    "brand": (["brand"], lambda r: (r["brand"] or "").strip().lower() or None),
+    # an explicit has_5g / has_nfc flag wins over mentions in the model name / feature lists
+    "5g": (["extra", "model", "network", "sim"], lambda r: extra_flag(r["extra"], "attr_has 5g") or
+           has_token("5g", r["model"], r["network"], r["sim"])),
+    "nfc": (["extra", "nfc", "sim"], lambda r: extra_flag(r["extra"], "attr_has nfc") or has_token("nfc", r["sim"]) or
+            ("yes" if r["nfc"] and str(r["nfc"]).strip().lower() not in ("no", "false", "0") else None)),
+    "os": (["os", "os_text"], lambda r: family(text_cell(r, "os"), OS_FAMILIES)),
+    "display_type": (["display_type"], lambda r: (r["display_type"] or "").lower().replace("display", "").strip() or None),
+    "chipset": (["chipset", "chipset_text", "cpu", "cpu_text"],
+                lambda r: family(text_cell(r, "chipset") or text_cell(r, "cpu"), CHIPSET_FAMILIES)),
+}
+
+# set bits in every byte value (popcount for NumPy < 2.0, which has no np.bitwise_count)
+POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.int64)
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """
+    Set bits per bitset (last axis summed).
+    """
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    return POPCOUNT[words.view(np.uint8)].sum(axis=-1)
+
+# ---- Bitsets ----
+class FacetIndex:
+    """
+    One packed bitset (one bit per catalog row, in uint64 words) per facet value.
+    A selection {"brand": ["samsung", "xiaomi"], "5g": ["yes"]} ORs the values of
+    a facet and ANDs the facets; counts come from the same bitsets in one pass,
+    each facet counted under the other facets' filters (so the sidebar still
+    shows how many phones picking another value of it would add).
+    """
+    def __init__(self, table, facets: dict = FACETS):
+        self.n_rows = table.num_rows
+        self.n_words = (self.n_rows + 63) // 64
+        columns = sorted({c for cols, _ in facets.values() for c in cols})
+        rows = table.select([c for c in columns if c in table.column_names]).to_pylist()
+        self.values = {}  # facet -> [value, ...] (most phones first)
+        self.bits = {}    # facet -> uint64 array (values, n_words)
+        self.positions = {}  # facet -> {value: row in bits}
+        for facet, (cols, get) in facets.items():
+            found = {}
+            for i, row in enumerate(rows):
+                value = get({c: row.get(c) for c in cols})
+                if value is not None:
+                    found.setdefault(value, []).append(i)
+            names = sorted(found, key=lambda v: (-len(found[v]), v))
+            bits = np.zeros((len(names), self.n_rows), dtype=bool)
+            for n, value in enumerate(names):
+                bits[n, found[value]] = True
+            self.values[facet] = names
+            self.bits[facet] = self.pack(bits)
+            self.positions[facet] = {v: n for n, v in enumerate(names)}
+
+    @classmethod
+    def load(cls, catalog_path: str = CATALOG_FILE) -> "FacetIndex":
+        # a key without numbers has no `key_text` column (and vice versa for text)
+        wanted = {c for cols, _ in FACETS.values() for c in cols}
+        return cls(load_catalog(catalog_path, columns=[c for c in catalog_columns(catalog_path) if c in wanted]))
+
+    # ---- Masks ----
+    def pack(self, flags: np.ndarray) -> np.ndarray:
+        """
+        Boolean row flags (last axis = rows) -> uint64 bitsets.
+        """
+        packed = np.packbits(flags, axis=-1)
+        pad = self.n_words * 8 - packed.shape[-1]
+        if pad:
+            packed = np.concatenate([packed, np.zeros(packed.shape[:-1] + (pad,), dtype=np.uint8)], axis=-1)
+        return np.ascontiguousarray(packed).view(np.uint64)
+
+    def unpack(self, words: np.ndarray) -> np.ndarray:
+        return np.unpackbits(words.view(np.uint8), count=self.n_rows).astype(bool)
+
+    def all_rows(self) -> np.ndarray:
+        return self.pack(np.ones(self.n_rows, dtype=bool))
+
+    def pack_rows(self, rows) -> np.ndarray:
+        """
+        Packed mask of row numbers (e.g. a CatalogEngine.query() result).
+        """
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[np.asarray(rows, dtype=np.int64)] = True
+        return self.pack(mask)
+
+    def facet_mask(self, facet: str, values) -> np.ndarray:
+        if facet not in self.bits:
+            raise KeyError(f"unknown facet: {facet}")
+        positions = [self.positions[facet][v] for v in (str(v).strip().lower() for v in values)
+                     if v in self.positions[facet]]
+        if not positions:
+            return np.zeros(self.n_words, dtype=np.uint64)
+        return np.bitwise_or.reduce(self.bits[facet][positions], axis=0)
+
+    def mask(self, selection: dict, within=None) -> np.ndarray:
+        mask = self.all_rows() if within is None else self.pack_rows(within)
+        for facet, values in selection.items():
+            if values:
+                mask &= self.facet_mask(facet, values)
+        return mask
+
+    # ---- Queries ----
+    def query(self, selection: dict, within=None) -> tuple[np.ndarray, dict]:
+        """
+        (matching row numbers, {facet: {value: count}}) for a selection; `within`
+        limits both to these rows (e.g. the phones a price/RAM range query returned).
+        """
+        base = self.all_rows() if within is None else self.pack_rows(within)
+        masks = {f: self.facet_mask(f, v) for f, v in selection.items() if v}
+        mask = base.copy()
+        for m in masks.values():
+            mask &= m
+
+        counts = {}
+        for facet, bits in self.bits.items():
+            if facet in masks:
+                # everything but this facet's own filter
+                others = base.copy()
+                for f, m in masks.items():
+                    if f != facet:
+                        others &= m
+            else:
+                others = mask
+            n = popcount(bits & others)
+            counts[facet] = {v: int(c) for v, c in zip(self.values[facet], n) if c}
+        rows = np.flatnonzero(self.unpack(mask))
+        return rows, counts
+
+    def count(self, selection: dict, within=None) -> int:
+        return int(popcount(self.mask(selection, within)))
+
+def parse_selection(items: list[str]) -> dict:
+    """
+    ['brand=samsung,xiaomi', '5g=yes'] -> {"brand": ["samsung", "xiaomi"], "5g": ["yes"]}
+    """
+    selection = {}
+    for item in items:
+        facet, _, values = item.partition("=")
+        if not values:
+            raise argparse.ArgumentTypeError(f"expected facet=value[,value...]: {item}")
+        selection.setdefault(facet.strip().lower(), []).extend(v.strip() for v in values.split(","))
+    return selection
+
+def main():
+    from Catalog_Query import CatalogEngine, parse_predicate
+
+    parser = argparse.ArgumentParser(description="Facet counts over the columnar phone catalog.")
+    parser.add_argument("select", nargs="*", help="facet filters, e.g. brand=samsung,xiaomi 5g=yes os=android")
+    parser.add_argument("--where", action="append", type=parse_predicate, default=[],
+                        help="numeric predicate applied first (Catalog_Query syntax), e.g. --where price<=20000")
+    parser.add_argument("--catalog", default=CATALOG_FILE)
+    parser.add_argument("--top", type=int, default=8, help="values shown per facet")
+    args = parser.parse_args()
+
+    t = time.perf_counter()
+    if args.where:
+        engine = CatalogEngine.load(args.catalog)
+        index = FacetIndex(engine.table)
+    else:
+        index = FacetIndex.load(args.catalog)
+    built = time.perf_counter() - t
+
+    t = time.perf_counter()
+    within = engine.query(args.where) if args.where else None
+    rows, counts = index.query(parse_selection(args.select), within)
+    took = time.perf_counter() - t
+    for facet, values in counts.items():
+        print(f"{facet}: " + json.dumps(dict(list(values.items())[:args.top]), ensure_ascii=False))
+    print(f"{len(rows)} of {index.n_rows} phones match ({took * 1000:.2f} ms; facets built in {built * 1000:.0f} ms)")
+
+if __name__ == "__main__":
+    main()
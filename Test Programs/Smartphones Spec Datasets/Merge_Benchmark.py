@@ -0,0 +1,159 @@
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from Run_Metrics import STAGES
+
+# === CONFIG ===
+REPORT_FILE = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Dataset_JSON\Benchmarks\merge_benchmark.json"
+SIZES = [10_000, 100_000, 1_000_000]
+
+# ---- Measurements ----
+def peak_rss_mb() -> float | None:
+    """
+    Peak resident set size of this process (psutil on Windows, resource elsewhere).
+    """
+    try:
+        import psutil
+        peak = getattr(psutil.Process().memory_info(), "peak_wset", None)
+        if peak is not None:
+            return round(peak / 2**20, 1)
+    except ImportError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / 2**20 if sys.platform == "darwin" else rss / 1024, 1)
+
+def run_merge(csv_files: list[str], output_dir: str) -> dict:
+    """
+    Merge `csv_files` into `output_dir` with a serial Merge_Kaggle_Datasets run
+    (process_csv_file per file) and report its RunMetrics stage totals. Runs in a
+    fresh process so peak RSS is this run's own.
+    """
+    import Merge_Kaggle_Datasets as m
+    from Buffered_Logger import BufferedLogger
+
+    m.OUTPUT_DIR = output_dir
+    m.CACHE_DIR = os.path.join(output_dir, "Cache")
+    m.LOG_FILE = os.path.join(output_dir, "Log", "benchmark_log.txt")
+    m.LOGGER = BufferedLogger(m.LOG_FILE, echo=False)  # per-file lines go to the log only
+    m.METRICS.reset()
+
+    store = m.BrandStore()
+    manifest = {"plans": {}}  # cold mapping manifest: every header is matched once
+    started = time.perf_counter()
+    for csv_path in csv_files:
+        m.process_csv_file(csv_path, store, manifest)
+    total = time.perf_counter() - started
+    m.LOGGER.close()
+
+    totals = m.METRICS.totals()
+    seconds = {stage: round(totals["seconds"].get(stage, 0.0), 3) for stage in STAGES}
+    rows = totals["counters"].get("rows", 0)
+
+    brand_files = [f for f in os.listdir(output_dir) if f.endswith(".json")]
+    phones = 0
+    for name in brand_files:
+        with open(os.path.join(output_dir, name), "r", encoding="utf-8") as f:
+            phones += len(json.load(f)["phones"])
+    return {
+        "rows": rows,
+        "brands": len(brand_files),
+        "phones": phones,
+        "seconds": {**seconds, "total": round(total, 3)},
+        "rows_per_second": round(rows / total) if total else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "counters": {k: v for k, v in totals["counters"].items() if k != "rows"},
+    }
+
+def benchmark_size(rows: int, data_dir: str) -> dict:
+    from Synthetic_Phone_CSV import generate_csvs
+
+    csv_dir = os.path.join(data_dir, f"rows_{rows}")
+    out_dir = os.path.join(data_dir, f"out_{rows}")
+    shutil.rmtree(out_dir, ignore_errors=True)
+    t = time.perf_counter()
+    csv_files = generate_csvs(rows, csv_dir)
+    generated = round(time.perf_counter() - t, 3)
+
+    # spawn: a forked child would start with the parent's memory
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        result = pool.submit(run_merge, csv_files, out_dir).result()
+    result["files"] = len(csv_files)
+    result["generate_seconds"] = generated
+    return result
+
+# ---- Report ----
+def environment() -> dict:
+    import numpy as np
+    import pandas as pd
+    import Merge_Kaggle_Datasets as m
+
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "chunk_rows": m.CSV_CHUNK_ROWS,
+    }
+
+def compare_reports(old: dict, new: dict):
+    """
+    Print new/old time ratios per size and stage (< 1.0 is faster).
+    """
+    old_runs = {r["rows"]: r for r in old.get("runs", [])}
+    for run in new["runs"]:
+        base = old_runs.get(run["rows"])
+        if base is None:
+            continue
+        ratios = []
+        for stage in STAGES + ["total"]:
+            a, b = base["seconds"].get(stage), run["seconds"].get(stage)
+            ratios.append(f"{stage}={b / a:.2f}x" if a else f"{stage}=n/a")
+        rss = f"{run['peak_rss_mb']} MB (was {base['peak_rss_mb']} MB)"
+        print(f"{run['rows']:>9} rows: " + ", ".join(ratios) + f", peak RSS {rss}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Time each merge stage on synthetic CSVs of growing size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="total rows per run")
+    parser.add_argument("--out", default=REPORT_FILE, help="JSON report path")
+    parser.add_argument("--data-dir", default=None, help="keep generated CSVs and outputs here (default: temp dir)")
+    parser.add_argument("--compare", default=None, help="earlier report to compare against")
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="merge_benchmark_")
+    report = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "environment": environment(), "runs": []}
+    try:
+        for rows in args.sizes:
+            result = benchmark_size(rows, data_dir)
+            report["runs"].append(result)
+            stages = ", ".join(f"{k}={v}s" for k, v in result["seconds"].items())
+            print(f"[OK] {rows} rows -> {result['phones']} phones in {result['brands']} brands; "
+                  f"{stages}; peak RSS {result['peak_rss_mb']} MB")
+    finally:
+        if args.data_dir is None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to: {args.out}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare_reports(json.load(f), report)
+
+if __name__ == "__main__":
+    main()
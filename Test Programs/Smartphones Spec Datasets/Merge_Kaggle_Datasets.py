@@ -1,29 +1,87 @@
 import os
 import re
+import csv
 import json
+import codecs
 import uuid
 import math
 import glob
 import hashlib
+import argparse
 from pathlib import Path
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
 from collections import defaultdict
 from difflib import SequenceMatcher
 
+import numpy as np
 import pandas as pd
 
+from Atomic_Write import atomic_path
+from Brand_Shards import FORMATS, forget_shards, read_brand_file, write_shard
+from Buffered_Logger import BufferedLogger
+from Phone_Record import PhoneRecord, to_json
+from Run_Metrics import RunMetrics, format_metrics
+from Unit_Normalization import NORMALIZED_KEYS, RULES, normalize_column, python_values, rules_fingerprint, unit_values
+
 # === CONFIG ===
 INPUT_DIR = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Datasets"
 OUTPUT_DIR = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Dataset_JSON"  # one JSON per brand
 LOG_FILE = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Dataset_JSON\Log\Kaggle_Merge_Log.txt"
+CACHE_DIR = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Dataset_JSON\Cache"
+MAPPING_MANIFEST = os.path.join(CACHE_DIR, "mapping_manifest.json")  # header signature -> column plan
+INPUT_MANIFEST = os.path.join(CACHE_DIR, "input_manifest.json")      # --incremental: per-CSV hash, plan, phone ids
+PARTIALS_DIR = os.path.join(CACHE_DIR, "partials")                    # --incremental: merged contribution per CSV
+ALIAS_TABLE = os.path.join(CACHE_DIR, "alias_table.json")            # Entity_Resolution.py: alias id -> canonical phone
+CATALOG_FILE = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Dataset_JSON\Catalog\catalog.parquet"
+SQLITE_DB = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Dataset_JSON\Store\phones.sqlite"  # --sqlite
+PHONE_INDEX = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Dataset_JSON\Index\phone_index.npy"  # Phone_Index.py (jsonl storage)
+SNAPSHOT_DIR = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Dataset_JSON\Snapshots"  # Catalog_Snapshot.py: per-run content hashes
+
+# Brand file format: "json" (one document per brand) or append-only shards "jsonl", "jsonl.gz", "jsonl.xz"
+STORAGE_FORMAT = "json"
+
+# Brand store write-back thresholds (dirty brands are always flushed at the end of each CSV)
+FLUSH_EVERY_ROWS = 50000         # flush dirty brands after this many merged rows (0 = disabled)
+FLUSH_MAX_CACHED_PHONES = 200000  # flush + drop the cache once it holds this many phones (0 = disabled)
+
+# CSVs are streamed in chunks of this many rows; encoding/delimiter are sniffed from the first SNIFF_BYTES
+CSV_CHUNK_ROWS = 100000
+SNIFF_BYTES = 64 * 1024
 
 # Create output dir
 os.makedirs(OUTPUT_DIR, exist_ok=True)
+os.makedirs(CACHE_DIR, exist_ok=True)
+
+# ---- Utility: logging (buffered, flushed by a background thread) ----
+LOGGER = None
+
+def start_log(level: str = "INFO", json_lines: bool = False, fresh: bool = False) -> BufferedLogger:
+    """
+    (Re)open the run log at LOG_FILE; fresh=True starts an empty file.
+    """
+    global LOGGER
+    if LOGGER is not None:
+        LOGGER.close()
+    if fresh and os.path.exists(LOG_FILE):
+        os.remove(LOG_FILE)
+    LOGGER = BufferedLogger(LOG_FILE, level=level, json_lines=json_lines)
+    return LOGGER
+
+def get_logger() -> BufferedLogger:
+    if LOGGER is None or LOGGER.path != LOG_FILE:
+        return start_log()
+    return LOGGER
+
+def log(msg: str, level: str | None = None, **fields):
+    get_logger().log(msg, level, **fields)
 
-# ---- Utility: logging (simple) ----
-def log(msg: str):
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(msg.rstrip() + "\n")
-    print(msg)
+# ---- Utility: run metrics (stage timers + counters, one scope per CSV) ----
+METRICS = RunMetrics()
+
+def log_metrics(scope: str, snapshot: dict):
+    if METRICS.enabled:
+        log(f"[STATS] {scope} -> {format_metrics(snapshot)}", scope=scope, **snapshot)
 
 # ---- Column name normalization helpers ----
 def clean_colname(name: str) -> str:
@@ -104,6 +162,60 @@ for canon, aliases in CANONICAL_KEYS.items():
     for a in aliases:
         ALIAS_TO_CANON[clean_colname(a)] = canon
 
+# ---- Alias index (fuzzy column matching without scanning every alias) ----
+def char_trigrams(cleaned: str) -> set:
+    padded = f"  {cleaned}  "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class AliasIndex:
+    """
+    Cleaned names with precomputed token sets and a trigram inverted index.
+
+    best_match() picks the same name as a full SequenceMatcher scan: two names
+    with no padded trigram in common are at least (longer+2)/3 insertions/deletions
+    apart, so their ratio is below 5/6 and they share no token either. Above that
+    threshold only names sharing a trigram need to be scored.
+    """
+    def __init__(self, names: dict):
+        self.entries = []                      # (cleaned name, target, tokens) in scan order
+        self.by_trigram = defaultdict(list)
+        for name, target in names.items():
+            cleaned = clean_colname(name)
+            i = len(self.entries)
+            self.entries.append((cleaned, target, set(cleaned.split())))
+            for g in char_trigrams(cleaned):
+                self.by_trigram[g].append(i)
+
+    def shortlist(self, cleaned: str, threshold: float):
+        if threshold <= 5 / 6:
+            return range(len(self.entries))
+        found = set()
+        for g in char_trigrams(cleaned):
+            found.update(self.by_trigram.get(g, ()))
+        return sorted(found)
+
+    def best_match(self, cleaned: str, threshold: float, overlap_bonus: float = 0.0):
+        """
+        Target of the first entry with the highest ratio (+ bonus per shared token), if >= threshold.
+        """
+        tokens = set(cleaned.split())
+        best, best_score = None, 0.0
+        for i in self.shortlist(cleaned, threshold):
+            name, target, name_tokens = self.entries[i]
+            bonus = overlap_bonus * len(tokens & name_tokens) if overlap_bonus else 0.0
+            # ratio <= 2*min(len)/sum(len): entries that cannot reach the threshold cannot win
+            if 2 * min(len(cleaned), len(name)) / (len(cleaned) + len(name)) + bonus < threshold:
+                continue
+            score = SequenceMatcher(None, cleaned, name).ratio() + bonus
+            if score > best_score:
+                best, best_score = target, score
+        if best and best_score >= threshold:
+            return best
+        return None
+
+ALIAS_INDEX = AliasIndex(ALIAS_TO_CANON)
+CANON_INDEX = AliasIndex({canon: canon for canon in CANONICAL_KEYS})
+
 # "Always try these first" when hunting brand/model
 PRIORITY_BRAND_CANDS = ["brand", "brand_name", "manufacturer", "company"]
 PRIORITY_MODEL_CANDS = ["model", "model_name", "phone_model", "device", "device_name", "product_name", "name", "title"]
@@ -114,6 +226,7 @@ def best_canonical(colname: str) -> str | None:
       1) direct alias hit
       2) fuzzy match against known aliases
       3) fuzzy match against canonical keys themselves
+    Fuzzy steps only score the names ALIAS_INDEX / CANON_INDEX shortlist.
     """
     if not colname:
         return None
@@ -121,33 +234,77 @@ def best_canonical(colname: str) -> str | None:
 
     # 1) Direct alias
     if cleaned in ALIAS_TO_CANON:
+        METRICS.add("alias_hits")
         return ALIAS_TO_CANON[cleaned]
+    METRICS.add("fuzzy_lookups")
 
-    # 2) Fuzzy over all known aliases
-    best, best_score = None, 0.0
-    for alias, canon in ALIAS_TO_CANON.items():
-        score = sim_ratio(cleaned, alias)
-        # token overlap bonus
-        tok_overlap = len(token_set(cleaned) & token_set(alias))
-        score += 0.05 * tok_overlap
-        if score > best_score:
-            best, best_score = canon, score
-
+    # 2) Fuzzy over known aliases (ratio + token overlap bonus)
     # Threshold: reasonably strict to avoid bad merges
-    if best and best_score >= 0.85:
+    best = ALIAS_INDEX.best_match(cleaned, 0.85, overlap_bonus=0.05)
+    if best:
         return best
 
     # 3) Fuzzy over canonical keys themselves (fallback)
-    for canon in CANONICAL_KEYS.keys():
-        score = sim_ratio(cleaned, canon)
-        if score > best_score:
-            best, best_score = canon, score
+    # Step 2 scored below 0.85 here, so only a canonical key can reach 0.90.
+    return CANON_INDEX.best_match(cleaned, 0.90)
 
-    if best and best_score >= 0.90:
-        return best
+# ---- Column mapping plan (computed once per header, not per cell) ----
+def fallback_attr_name(colname: str) -> str:
+    # keep a safe fallback name (normalized but prefixed to avoid collision)
+    return f"attr_{clean_colname(colname)}"
 
-    # No confident match
-    return None
+def build_mapping_plan(columns) -> dict:
+    """
+    Map every raw column of a DataFrame to its canonical key (or attr_* fallback).
+    """
+    plan = {}
+    for raw_col in columns:
+        name = str(raw_col)
+        if name not in plan:
+            plan[name] = best_canonical(name) or fallback_attr_name(name)
+    return plan
+
+def header_signature(columns) -> str:
+    return hashlib.sha1(json.dumps([str(c) for c in columns], ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def alias_fingerprint() -> str:
+    """
+    Changes whenever CANONICAL_KEYS changes, which invalidates stored plans.
+    """
+    items = sorted(ALIAS_TO_CANON.items()) + [("", k) for k in CANONICAL_KEYS]
+    return hashlib.sha1(json.dumps(items).encode("utf-8")).hexdigest()
+
+def load_mapping_manifest() -> dict:
+    fingerprint = alias_fingerprint()
+    if os.path.exists(MAPPING_MANIFEST):
+        try:
+            with open(MAPPING_MANIFEST, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("alias_fingerprint") == fingerprint:
+                return manifest
+        except (OSError, ValueError):
+            pass
+    return {"alias_fingerprint": fingerprint, "plans": {}}
+
+def save_mapping_manifest(manifest: dict):
+    atomic_write_json(Path(MAPPING_MANIFEST), manifest)
+
+def mapping_plan_for(columns, manifest: dict | None = None) -> dict:
+    """
+    Look the header up in the manifest first; only unseen headers pay for fuzzy matching.
+    """
+    if manifest is None:
+        return build_mapping_plan(columns)
+    sig = header_signature(columns)
+    plan = manifest["plans"].get(sig)
+    if plan is None:
+        plan = build_mapping_plan(columns)
+        manifest["plans"][sig] = plan
+        manifest["dirty"] = True
+        METRICS.add("plan_cache_misses")
+    else:
+        METRICS.add("plan_cache_hits")
+    return plan
 
 # ---- Brand/Model extraction ----
 def find_column(df: pd.DataFrame, candidates: list[str]) -> str | None:
@@ -197,33 +354,143 @@ def stable_phone_id(brand: str, model: str) -> str:
     return str(uuid.uuid5(uuid.NAMESPACE_URL, base))
 
 # ---- Safe JSON IO per brand ----
-def brand_file_path(brand: str) -> Path:
-    safe = re.sub(r"[^a-zA-Z0-9_\-]+", "_", brand.strip())
-    return Path(OUTPUT_DIR) / f"{safe}.json"
+def brand_file_stem(brand: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_\-]+", "_", brand.strip())
+
+def brand_file_path(brand: str, fmt: str | None = None) -> Path:
+    return Path(OUTPUT_DIR) / f"{brand_file_stem(brand)}{FORMATS[fmt or STORAGE_FORMAT]}"
 
 def load_brand_db(brand: str) -> dict:
-    path = brand_file_path(brand)
-    if path.exists():
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return {"brand": brand, "phones": {}}  # phones: id -> phone_obj
+    """
+    Read the brand in STORAGE_FORMAT, or in another format left by an earlier run
+    (the next save converts it).
+    """
+    for fmt in [STORAGE_FORMAT] + [f for f in FORMATS if f != STORAGE_FORMAT]:
+        path = brand_file_path(brand, fmt)
+        if path.exists():
+            return read_brand_file(path)
+    return {"brand": brand, "phones": {}}  # phones: id -> PhoneRecord
+
+def atomic_write_json(path: Path, data):
+    """
+    Atomic write: dump to a temp file next to the target, then rename over it,
+    so an interrupted run never leaves a truncated JSON behind.
+    """
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2, default=to_json)
+        if METRICS.enabled:
+            METRICS.add("files_written")
+            METRICS.add("bytes_written", os.path.getsize(tmp_path))
 
 def save_brand_db(brand: str, data: dict):
-    path = brand_file_path(brand)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    if STORAGE_FORMAT == "json":
+        atomic_write_json(brand_file_path(brand), data)
+    else:
+        written = write_shard(brand_file_path(brand), data)
+        if written:
+            METRICS.add("files_written")
+            METRICS.add("bytes_written", written)
+    delete_brand_db(brand, keep=STORAGE_FORMAT)
+
+def delete_brand_db(brand: str, keep: str | None = None):
+    """
+    Remove the brand's file in every format except `keep`.
+    """
+    for fmt in FORMATS:
+        if fmt != keep:
+            brand_file_path(brand, fmt).unlink(missing_ok=True)
+
+# ---- In-memory brand store (write-back cache) ----
+class BrandStore:
+    """
+    Holds every brand DB touched during a run, tracks which ones changed and
+    writes each dirty brand once per flush instead of once per row.
+
+    Brands are keyed by their output path, so two spellings that land in the
+    same file share one cached DB (exactly like repeated load/save did).
+    Saving goes through save_brand_db, so STORAGE_FORMAT decides how.
+    """
+
+    def __init__(self, flush_every_rows: int = FLUSH_EVERY_ROWS,
+                 max_cached_phones: int = FLUSH_MAX_CACHED_PHONES):
+        self.flush_every_rows = flush_every_rows
+        self.max_cached_phones = max_cached_phones
+        self._dbs = {}      # path key -> brand db
+        self._names = {}    # path key -> brand name used for save_brand_db
+        self._dirty = set()
+        self._rows_since_flush = 0
+        self._cached_phones = 0
+
+    @staticmethod
+    def key(brand: str) -> str:
+        return os.path.normcase(str(brand_file_path(brand, "json")))
+
+    def get(self, brand: str) -> dict:
+        key = self.key(brand)
+        db = self._dbs.get(key)
+        if db is None:
+            METRICS.add("brand_loads")
+            db = load_brand_db(brand)
+            self._dbs[key] = db
+            self._names[key] = brand
+            self._cached_phones += len(db["phones"])
+        else:
+            METRICS.add("brand_cache_hits")
+        return db
+
+    def mark_dirty(self, brand: str, new_phones: int = 0):
+        self._dirty.add(self.key(brand))
+        self._cached_phones += new_phones
+
+    def row_merged(self):
+        """
+        Count one merged row and flush if a configured threshold is reached.
+        """
+        self._rows_since_flush += 1
+        if self.max_cached_phones and self._cached_phones >= self.max_cached_phones:
+            self.flush(evict=True)
+        elif self.flush_every_rows and self._rows_since_flush >= self.flush_every_rows:
+            self.flush()
+
+    def flush(self, evict: bool = False) -> int:
+        """
+        Write every dirty brand once. With evict=True the cache is emptied too.
+        Returns the number of brand files written (or removed, when empty).
+        """
+        written = 0
+        with METRICS.timer("persist"):
+            for key in list(self._dirty):
+                if self._dbs[key]["phones"]:
+                    save_brand_db(self._names[key], self._dbs[key])
+                else:
+                    # every phone was withdrawn (incremental mode): drop the brand file
+                    delete_brand_db(self._names[key])
+                written += 1
+        self._dirty.clear()
+        self._rows_since_flush = 0
+        if evict:
+            self._dbs.clear()
+            self._names.clear()
+            self._cached_phones = 0
+            forget_shards()
+        return written
 
 # ---- Merge rule: keep first non-empty ----
+NULL_TOKENS = {"", "na", "n/a", "none", "null", "nan"}
+
 def is_meaningful(val) -> bool:
     if val is None:
         return False
     if isinstance(val, float) and (math.isnan(val) or math.isinf(val)):
         return False
     s = str(val).strip()
-    if s == "" or s.lower() in {"na", "n/a", "none", "null", "nan"}:
+    if s.lower() in NULL_TOKENS:
         return False
     return True
 
+LEADING_NUMBER_RE = r"^(\d+(?:\.\d+)?)"
+
 def maybe_cast_number(s: str):
     """
     Try to cast numeric-looking strings to int/float; else return original.
@@ -232,7 +499,7 @@ def maybe_cast_number(s: str):
         return s
     st = s.strip().replace(",", "")
     # simple battery like '5000 mAh' -> '5000'
-    m = re.match(r"^(\d+(?:\.\d+)?)", st)
+    m = re.match(LEADING_NUMBER_RE, st)
     if m:
         num = m.group(1)
         try:
@@ -243,6 +510,9 @@ def maybe_cast_number(s: str):
             return s
     return s
 
+# Fields that should be stored as lists when different values exist
+LIST_FIELDS = {'ram', 'storage', 'colors', 'price', 'price_currency', 'color'}
+
 def merge_attributes(existing: dict, incoming: dict):
     """
     Merge incoming attributes into existing attributes following:
@@ -251,9 +521,6 @@ def merge_attributes(existing: dict, incoming: dict):
       - If new key, add it.
       - Normalize / cast some numeric-like values.
     """
-    # Fields that should be stored as lists when different values exist
-    list_fields = {'ram', 'storage', 'colors', 'price', 'color'}
-    
     for k, v in incoming.items():
         if not is_meaningful(v):
             continue
@@ -263,7 +530,7 @@ def merge_attributes(existing: dict, incoming: dict):
         if k not in existing or not is_meaningful(existing.get(k)):
             # New key or existing key has no meaningful value
             existing[k] = normalized_v
-        elif k in list_fields:
+        elif k in LIST_FIELDS:
             # Special handling for list fields
             existing_val = existing[k]
             
@@ -287,101 +554,639 @@ def merge_attributes(existing: dict, incoming: dict):
                 existing[k] = existing_val
         # For non-list fields, keep existing value (don't overwrite)
 
-# ---- Row -> normalized attribute dict ----
-def row_to_attributes(row: pd.Series, brand_col: str, model_col: str) -> tuple[str | None, str | None, dict]:
+def merge_partial_attributes(existing: dict, partial: dict):
     """
-    Returns (brand, model, attributes) for a row.
+    Merge attributes that were already merged on their own (a worker's partial)
+    so the result equals feeding the original rows one by one:
+    a missing key takes the partial value as is, a list field replays its items.
     """
-    brand_val = str(row.get(brand_col, "")).strip() if brand_col else ""
-    model_val = str(row.get(model_col, "")).strip() if model_col else ""
+    for k, v in partial.items():
+        if k not in existing or not is_meaningful(existing.get(k)):
+            existing[k] = list(v) if isinstance(v, list) else v
+        elif k in LIST_FIELDS:
+            for item in (v if isinstance(v, list) else [v]):
+                merge_attributes(existing, {k: item})
 
-    # If brand missing, try to split from model
-    if not is_meaningful(brand_val) and is_meaningful(model_val):
-        guess_b, new_model = split_brand_from_model(model_val)
-        if guess_b:
-            brand_val = guess_b
-            model_val = new_model
+# ---- Columnar ingestion (rows -> normalized attribute dicts) ----
+_MISSING = object()  # masked-out cell
 
-    if not is_meaningful(brand_val) or not is_meaningful(model_val):
-        return None, None, {}
+def meaningful_mask(col: pd.Series) -> np.ndarray:
+    """
+    Column-wise is_meaningful().
+    """
+    if pd.api.types.is_bool_dtype(col) or pd.api.types.is_integer_dtype(col):
+        return np.ones(len(col), dtype=bool)
+    if pd.api.types.is_float_dtype(col):
+        return np.isfinite(col.to_numpy(dtype=float))
+    text = col.astype(str).str.strip().str.lower()
+    mask = ~(col.isna() | text.isin(NULL_TOKENS)).to_numpy()
+    # float inf stored in an object column
+    maybe_inf = mask & text.isin({"inf", "-inf"}).to_numpy()
+    if maybe_inf.any():
+        mask[maybe_inf] = [not isinstance(v, float) for v in col.to_numpy()[maybe_inf]]
+    return mask
 
-    attributes = {}
-    for raw_col, val in row.items():
-        if raw_col == brand_col or raw_col == model_col:
+def cast_numbers(col: pd.Series) -> list:
+    """
+    Column-wise maybe_cast_number(); returns plain Python values.
+    """
+    values = col.tolist()
+    if pd.api.types.is_numeric_dtype(col):
+        return values
+    try:
+        num = (col.str.strip().str.replace(",", "", regex=False)
+                  .str.extract(LEADING_NUMBER_RE, expand=False).dropna())
+    except AttributeError:
+        # no string cells to cast
+        return values
+    if not num.empty:
+        has_dot = num.str.contains(".", regex=False)
+        for idx, v in num[has_dot].map(float).items():
+            values[idx] = v
+        for idx, v in num[~has_dot].map(int).items():
+            values[idx] = v
+    return values
+
+def split_brand_model_columns(brand: pd.Series, model: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """
+    Vectorized split_brand_from_model() for rows that have a model but no brand.
+    """
+    need = ~pd.Series(meaningful_mask(brand), index=brand.index) & pd.Series(meaningful_mask(model), index=model.index)
+    if not need.any():
+        return brand, model
+    tokens = model[need].str.split()
+    first = tokens.str[0]
+    ok = (
+        (tokens.str.len() > 1)
+        & (first.str[0].str.isupper() | first.str.isupper())
+        & first.str.len().between(2, 12)
+    )
+    ok = ok[ok].index
+    brand, model = brand.copy(), model.copy()
+    brand[ok] = first[ok]
+    model[ok] = tokens[ok].str[1:].str.join(" ").str.strip()
+    return brand, model
+
+def frame_to_records(df: pd.DataFrame, brand_col: str | None, model_col: str, plan: dict,
+                     aliases: dict | None = None):
+    """
+    Yield (brand, model, phone_id, attributes) per usable row, computed column-wise:
+    columns are renamed via the mapping plan, brand/model split and phone ids are
+    Series ops, and non-meaningful cells are masked out before records are built.
+    Ids found in the alias table are redirected to their canonical phone (brand, model and id).
+    Keys in Unit_Normalization.RULES become numbers in their canonical unit
+    (price keeps its currency in price_currency).
+    The column-wise part is timed as the "convert" stage.
+    """
+    with METRICS.timer("convert"):
+        df = df.reset_index(drop=True)
+        empty = pd.Series("", index=df.index, dtype=object)
+        brand = df[brand_col].astype(str).str.strip() if brand_col else empty
+        model = df[model_col].astype(str).str.strip() if model_col else empty
+        brand, model = split_brand_model_columns(brand, model)
+
+        valid = meaningful_mask(brand) & meaningful_mask(model)
+        if not valid.any():
+            return
+        brand, model = brand[valid], model[valid]
+        # stable_phone_id() once per distinct normalized 'brand|model'
+        keys = brand.str.lower() + "|" + model.str.lower()
+        ids = {k: str(uuid.uuid5(uuid.NAMESPACE_URL, k)) for k in keys.unique()}
+        phone_ids = keys.map(ids)
+        if aliases:
+            hit = phone_ids.isin(aliases.keys())
+            if hit.any():
+                canon = [aliases[pid] for pid in phone_ids[hit]]
+                # the canonical phone's brand too, so the row lands in its brand file
+                brand, model, phone_ids = brand.copy(), model.copy(), phone_ids.copy()
+                brand[hit] = [a["brand"] for a in canon]
+                model[hit] = [a["model"] for a in canon]
+                phone_ids[hit] = [a["id"] for a in canon]
+
+        # Last raw column wins for a canonical key; key order follows first appearance
+        sources = {}
+        for raw_col in df.columns:
+            if raw_col == brand_col or raw_col == model_col:
+                continue
+            sources[plan[str(raw_col)]] = raw_col
+
+        sub = df[valid]
+        canon_keys, columns = [], []
+        for canon, raw_col in sources.items():
+            col = sub[raw_col]
+            keep = meaningful_mask(col)
+            if not keep.any():
+                continue
+            units = None
+            if canon in NORMALIZED_KEYS:
+                # unit-aware parsing; cells without a usable number are dropped
+                col = col.reset_index(drop=True)
+                frame = normalize_column(canon, col)
+                values = python_values(frame, canon, col)
+                keep &= np.array([v is not None for v in values], dtype=bool)
+                if not keep.any():
+                    continue
+                if "unit_key" in RULES[canon]:
+                    units = unit_values(frame, values)
+            else:
+                values = cast_numbers(col.reset_index(drop=True))
+            canon_keys.append(canon)
+            columns.append([v if k else _MISSING for v, k in zip(values, keep)])
+            if units is not None:
+                # e.g. price_currency next to price
+                canon_keys.append(RULES[canon]["unit_key"])
+                columns.append([u if k and u is not None else _MISSING for u, k in zip(units, keep)])
+
+        rows = zip(*columns) if columns else ([] for _ in range(len(sub)))
+        brands, models, pids = brand.tolist(), model.tolist(), phone_ids.tolist()
+    for b, m, pid, row in zip(brands, models, pids, rows):
+        yield b, m, pid, {k: v for k, v in zip(canon_keys, row) if v is not _MISSING}
+
+# ---- Near-duplicate models (alias table written by Entity_Resolution.py) ----
+def load_alias_table() -> dict:
+    """
+    alias phone id -> {"id": canonical id, "brand", "model": canonical model, "alias_brand", "alias_model"}
+    """
+    if not os.path.exists(ALIAS_TABLE):
+        return {}
+    with open(ALIAS_TABLE, "r", encoding="utf-8") as f:
+        return json.load(f).get("aliases", {})
+
+def alias_digest(aliases: dict) -> str:
+    return hashlib.sha1(json.dumps(aliases, sort_keys=True).encode("utf-8")).hexdigest()
+
+def fold_aliases(store: BrandStore, aliases: dict) -> int:
+    """
+    Move alias records left over from earlier runs into their canonical phone.
+    Returns the number of records folded.
+    """
+    folded = 0
+    for alias_id, canon in aliases.items():
+        alias = store.get(canon["alias_brand"])["phones"].pop(alias_id, None)
+        if alias is None:
             continue
-        canon = best_canonical(str(raw_col))
-        if canon is None:
-            # keep a safe fallback name (normalized but prefixed to avoid collision)
-            canon = f"attr_{clean_colname(str(raw_col))}"
-        attributes[canon] = val
-    return brand_val, model_val, attributes
+        store.mark_dirty(canon["alias_brand"])
+        is_new = merge_phone(store.get(canon["brand"])["phones"], canon["id"], canon["brand"],
+                             canon["model"], alias["attributes"], merge=merge_partial_attributes)
+        store.mark_dirty(canon["brand"], new_phones=int(is_new) - 1)
+        folded += 1
+    return folded
 
 # ---- Main processing ----
-def process_csv_file(csv_path: str):
+# ---- Streaming CSV reader (memory bounded by CSV_CHUNK_ROWS, not the file size) ----
+def _latin1_fallback(err: UnicodeDecodeError):
+    # a stray non-UTF-8 byte past the sniffed prefix is read as latin-1 instead of failing mid-stream
+    return bytes(err.object[err.start:err.end]).decode("latin-1"), err.end
+
+codecs.register_error("latin1_fallback", _latin1_fallback)
+
+def sniff_csv(csv_path: str) -> dict:
+    """
+    Decide encoding and delimiter once from the file prefix; returns pd.read_csv options.
+    UTF-8 unless the prefix is not valid UTF-8 (then latin-1, as before).
+    """
+    with open(csv_path, "rb") as f:
+        prefix = f.read(SNIFF_BYTES)
     try:
-        df = pd.read_csv(csv_path, encoding="utf-8")
+        # incremental decoder: a character split at the prefix boundary is not an error
+        sample = codecs.getincrementaldecoder("utf-8")().decode(prefix)
+        options = {"encoding": "utf-8", "encoding_errors": "latin1_fallback"}
     except UnicodeDecodeError:
-        df = pd.read_csv(csv_path, encoding="latin-1")
+        sample = prefix.decode("latin-1")
+        options = {"encoding": "latin-1"}
+
+    # only whole lines go to the sniffer
+    sample = sample[:sample.rfind("\n") + 1] or sample
+    try:
+        options["sep"] = csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+    except csv.Error:
+        options["sep"] = ","
+    return options
+
+def stream_records(reader, first: pd.DataFrame, csv_path: str, brand_col: str | None, model_col: str,
+                   plan: dict, aliases: dict | None, emit=log, stats: dict | None = None):
+    """
+    frame_to_records over the first chunk and then every following chunk of `reader`.
+    stats["rows"] counts the CSV rows read so far.
+    """
+    stats = {} if stats is None else stats
+    rows = stats["rows"] = len(first)
+    with reader:
+        yield from frame_to_records(first, brand_col, model_col, plan, aliases)
+        while True:
+            try:
+                with METRICS.timer("read"):
+                    chunk = next(reader, None)
+            except Exception as e:
+                emit(f"[WARN] {csv_path} -> read error after {rows} rows, rest of file skipped: {e}")
+                return
+            if chunk is None:
+                return
+            rows = stats["rows"] = rows + len(chunk)
+            yield from frame_to_records(chunk, brand_col, model_col, plan, aliases)
+
+def read_csv_records(csv_path: str, manifest: dict | None = None, emit=log,
+                     aliases: dict | None = None, stats: dict | None = None):
+    """
+    Open one CSV as a chunked stream and return (record iterator, mapping plan);
+    see frame_to_records. Brand/model columns and the plan come from the header.
+    Returns (None, None) when the file is skipped. Messages go through `emit`,
+    rows read are counted in `stats`.
+    """
+    try:
+        with METRICS.timer("read"):
+            reader = pd.read_csv(csv_path, chunksize=CSV_CHUNK_ROWS, **sniff_csv(csv_path))
+            first = next(reader, None)
     except Exception as e:
-        log(f"[SKIP] {csv_path} -> read error: {e}")
-        return
+        emit(f"[SKIP] {csv_path} -> read error: {e}")
+        return None, None
 
-    if df.empty:
-        log(f"[SKIP] {csv_path} -> empty file")
-        return
+    if first is None or first.empty:
+        reader.close()
+        emit(f"[SKIP] {csv_path} -> empty file")
+        return None, None
 
-    brand_col, model_col = guess_brand_model(df)
+    with METRICS.timer("detect"):
+        brand_col, model_col = guess_brand_model(first)
     if brand_col is None and model_col is None:
-        log(f"[WARN] {csv_path} -> no obvious brand/model columns; attempting generic heuristics.")
+        emit(f"[WARN] {csv_path} -> no obvious brand/model columns; attempting generic heuristics.")
         # As a last resort, try to find a single 'name' column as model
         # Brand may be parsed from model by split_brand_from_model
-        possible = [c for c in df.columns if clean_colname(c) in {"name", "title", "product_name"}]
+        possible = [c for c in first.columns if clean_colname(c) in {"name", "title", "product_name"}]
         model_col = possible[0] if possible else None
 
     if model_col is None:
-        log(f"[SKIP] {csv_path} -> couldn't find model column.")
-        return
+        reader.close()
+        emit(f"[SKIP] {csv_path} -> couldn't find model column.")
+        return None, None
 
-    # Process rows
-    n_rows = 0
-    n_merged = 0
-    for _, row in df.iterrows():
-        brand, model, attrs = row_to_attributes(row, brand_col, model_col)
-        if not (brand and model):
-            continue
+    # Fuzzy column matching happens once per header (or never, if the manifest knows it)
+    with METRICS.timer("mapping"):
+        plan = mapping_plan_for(first.columns, manifest)
+    return stream_records(reader, first, csv_path, brand_col, model_col, plan, aliases, emit, stats), plan
 
-        brand = str(brand).strip()
-        model = str(model).strip()
+def merge_phone(phones: dict, phone_id: str, brand: str, model: str, attrs: dict,
+                merge=merge_attributes) -> bool:
+    """
+    Merge one phone's attributes into a brand's phones map. Returns True if the phone is new.
+    """
+    # Initialize if new
+    is_new = phone_id not in phones
+    if is_new:
+        phones[phone_id] = PhoneRecord(phone_id, brand, model)
 
-        db = load_brand_db(brand)
-        phones = db["phones"]
+    # Merge attributes: keep first non-empty value per key
+    merge(phones[phone_id]["attributes"], attrs)
+    return is_new
 
-        phone_id = stable_phone_id(brand, model)
-        # Initialize if new
-        if phone_id not in phones:
-            phones[phone_id] = {
-                "id": phone_id,
-                "brand": brand,
-                "model": model,
-                "attributes": {}
-            }
+def process_csv_file(csv_path: str, store: BrandStore | None = None, manifest: dict | None = None,
+                     aliases: dict | None = None):
+    if store is None:
+        store = BrandStore()
+    stats = {}
+    METRICS.begin()
+    records, _ = read_csv_records(csv_path, manifest, aliases=aliases, stats=stats)
+    if records is None:
+        get_logger().count(csv_path, files_skipped=1)
+        METRICS.end()
+        return
 
-        # Merge attributes: keep first non-empty value per key
-        merge_attributes(phones[phone_id]["attributes"], attrs)
+    # Process rows
+    n_rows = 0
+    n_merged = 0
+    n_new = 0
+    for brand, model, phone_id, attrs in records:
+        with METRICS.timer("merge"):
+            is_new = merge_phone(store.get(brand)["phones"], phone_id, brand, model, attrs)
+            store.mark_dirty(brand, new_phones=int(is_new))
 
         # Persist occasionally to avoid big memory for huge datasets
-        db["phones"] = phones
-        save_brand_db(brand, db)
+        store.row_merged()
 
         n_rows += 1
         n_merged += 1
+        n_new += is_new
 
+    # Every touched brand is written once per file
+    store.flush()
     log(f"[OK] {csv_path} -> processed {n_rows} rows, merged {n_merged} entries.")
+    get_logger().count(csv_path, rows=stats["rows"], merged=n_merged,
+                       skipped=stats["rows"] - n_merged, new_phones=n_new)
+    METRICS.add("rows", stats["rows"])
+    log_metrics(csv_path, METRICS.end())
+
+# ---- Parallel mode: one CSV per worker, ordered reduce in the parent ----
+def build_partial(csv_path: str, manifest: dict | None = None, aliases: dict | None = None,
+                  metrics: bool = True) -> dict:
+    """
+    Worker side: turn one CSV into a partial brand -> phones map without touching
+    the output directory. Log messages, newly computed mapping plans and the
+    file's metrics are returned so the parent can replay them in file order.
+    """
+    METRICS.enabled = metrics
+    METRICS.begin()
+    messages = []
+    partial = {}  # brand path key -> {"brand": ..., "phones": {...}}
+    stats = {}
+    records, plan = read_csv_records(csv_path, manifest, emit=messages.append, aliases=aliases, stats=stats)
+    if records is not None:
+        n_rows = 0
+        for brand, model, phone_id, attrs in records:
+            with METRICS.timer("merge"):
+                db = partial.setdefault(BrandStore.key(brand), {"brand": brand, "phones": {}})
+                merge_phone(db["phones"], phone_id, brand, model, attrs)
+            n_rows += 1
+        messages.append(f"[OK] {csv_path} -> processed {n_rows} rows, merged {n_rows} entries.")
+        counts = {"rows": stats["rows"], "merged": n_rows, "skipped": stats["rows"] - n_rows}
+        METRICS.add("rows", stats["rows"])
+    else:
+        counts = {"files_skipped": 1}
+    new_plans = manifest["plans"] if manifest is not None and manifest.get("dirty") else {}
+    return {"partial": partial, "messages": messages, "plans": new_plans, "plan": plan, "counts": counts,
+            "metrics": METRICS.end(keep=False)}
+
+def merge_partial(store: BrandStore, partial: dict):
+    """
+    Reduce step: fold a worker's partial into the store with merge_attributes semantics.
+    Returns the number of phones new to the store.
+    """
+    total_new = 0
+    for part in partial.values():
+        brand = part["brand"]
+        phones = store.get(brand)["phones"]
+        new_phones = 0
+        for phone_id, phone in part["phones"].items():
+            new_phones += merge_phone(phones, phone_id, phone["brand"], phone["model"],
+                                      phone["attributes"], merge=merge_partial_attributes)
+        store.mark_dirty(brand, new_phones=new_phones)
+        total_new += new_phones
+    return total_new
+
+def replay_worker_output(csv_path: str, result: dict, manifest: dict):
+    """
+    Log a worker's messages and adopt its new mapping plans, as a serial run would have.
+    """
+    log(f"--> {csv_path}")
+    for msg in result["messages"]:
+        log(msg)
+    get_logger().count(csv_path, **result["counts"])
+    if result["plans"]:
+        manifest["plans"].update(result["plans"])
+        manifest["dirty"] = True
+
+def merge_parallel(csv_files: list[str], store: BrandStore, manifest: dict, workers: int,
+                   aliases: dict | None = None):
+    """
+    Map CSVs to partials in a process pool; partials are reduced strictly in the
+    original file order, so the brand JSON matches a serial run byte for byte.
+    """
+    for csv_path, result in build_partials(csv_files, manifest, workers, aliases):
+        METRICS.begin()
+        METRICS.absorb(result["metrics"])
+        replay_worker_output(csv_path, result, manifest)
+        with METRICS.timer("merge"):
+            new_phones = merge_partial(store, result["partial"])
+        if result["partial"]:
+            get_logger().count(csv_path, new_phones=new_phones)
+        store.flush()
+        log_metrics(csv_path, METRICS.end())
+
+def build_partials(csv_files: list[str], manifest: dict, workers: int, aliases: dict | None = None):
+    """
+    Yield (csv_path, build_partial result) in file order, using a pool if workers > 1.
+    """
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from zip(csv_files, pool.map(build_partial, csv_files, repeat(manifest), repeat(aliases),
+                                               repeat(METRICS.enabled)))
+    else:
+        for csv_path in csv_files:
+            yield csv_path, build_partial(csv_path, manifest, aliases, METRICS.enabled)
+
+# ---- Incremental mode: content-hash manifest over the input CSVs ----
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def load_input_manifest(aliases: dict) -> dict:
+    """
+    {"alias_fingerprint", "alias_table", "unit_rules", "files": {csv_path: {"sha256", "plan", "phones": {brand: [ids]}}}}
+    Entries made under a different CANONICAL_KEYS, alias table or unit rules are dropped
+    (their files count as changed).
+    """
+    fingerprint, table, rules = alias_fingerprint(), alias_digest(aliases), rules_fingerprint()
+    if os.path.exists(INPUT_MANIFEST):
+        try:
+            with open(INPUT_MANIFEST, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if (manifest.get("alias_fingerprint") == fingerprint and manifest.get("alias_table") == table
+                    and manifest.get("unit_rules") == rules):
+                return manifest
+        except (OSError, ValueError):
+            pass
+    return {"alias_fingerprint": fingerprint, "alias_table": table, "unit_rules": rules, "files": {}}
+
+def partial_path(sha256: str) -> Path:
+    return Path(PARTIALS_DIR) / f"{sha256}.json"
+
+def load_partial(sha256: str) -> list:
+    with open(partial_path(sha256), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def merge_incremental(csv_files: list[str], store: BrandStore, mapping_manifest: dict, workers: int,
+                      aliases: dict | None = None):
+    """
+    Only CSVs whose content hash changed are re-read; their merged contribution is
+    cached under PARTIALS_DIR. Every phone id contributed by a changed or removed
+    file is then rebuilt from the cached contributions of all current files, in
+    file order, and written back in place. Untouched phones are never recomputed.
+    """
+    manifest = load_input_manifest(aliases or {})
+    old_files = manifest["files"]
+    hashes = {csv_path: file_sha256(csv_path) for csv_path in csv_files}
+
+    changed = [p for p in csv_files if old_files.get(p, {}).get("sha256") != hashes[p]]
+    removed = [p for p in old_files if p not in hashes]
+    for csv_path in csv_files:
+        if csv_path not in changed:
+            log(f"[UNCHANGED] {csv_path}")
+    for csv_path in removed:
+        log(f"[REMOVED] {csv_path}")
+
+    # (brand, phone id) pairs whose records must be rebuilt, in first-seen order
+    affected = {}
+    for csv_path in changed + removed:
+        for brand, ids in old_files.get(csv_path, {}).get("phones", {}).items():
+            for phone_id in ids:
+                affected.setdefault((BrandStore.key(brand), phone_id), brand)
+
+    new_files = {p: old_files[p] for p in csv_files if p not in changed}
+    fresh = {}  # sha256 -> partial (this run)
+    for csv_path, result in build_partials(changed, mapping_manifest, workers, aliases):
+        METRICS.begin()
+        METRICS.absorb(result["metrics"])
+        replay_worker_output(csv_path, result, mapping_manifest)
+        sha = hashes[csv_path]
+        parts = list(result["partial"].values())
+        with METRICS.timer("persist"):
+            atomic_write_json(partial_path(sha), parts)
+        fresh[sha] = parts
+        new_files[csv_path] = {
+            "sha256": sha,
+            "plan": result["plan"],
+            "phones": {part["brand"]: list(part["phones"]) for part in parts},
+        }
+        log_metrics(csv_path, METRICS.end())
+
+    # Changed files may add ids that did not exist before; keep file order for new phones
+    ordered = {}
+    for csv_path in csv_files:
+        if csv_path in changed:
+            for brand, ids in new_files[csv_path]["phones"].items():
+                for phone_id in ids:
+                    ordered.setdefault((BrandStore.key(brand), phone_id), brand)
+    ordered.update((k, b) for k, b in affected.items() if k not in ordered)
+
+    # Which current files contribute to each affected phone
+    contributors = defaultdict(list)
+    for csv_path in csv_files:
+        for brand, ids in new_files[csv_path]["phones"].items():
+            key = BrandStore.key(brand)
+            for phone_id in ids:
+                if (key, phone_id) in ordered:
+                    contributors[(key, phone_id)].append(new_files[csv_path]["sha256"])
+
+    METRICS.begin()
+    loaded = dict(fresh)
+    for (key, phone_id), brand in ordered.items():
+        rebuilt = {}
+        for sha in contributors.get((key, phone_id), []):
+            if sha not in loaded:
+                with METRICS.timer("read"):
+                    loaded[sha] = load_partial(sha)
+            for part in loaded[sha]:
+                phone = part["phones"].get(phone_id)
+                if phone is not None and BrandStore.key(part["brand"]) == key:
+                    with METRICS.timer("merge"):
+                        merge_phone(rebuilt, phone_id, phone["brand"], phone["model"],
+                                    phone["attributes"], merge=merge_partial_attributes)
+        phones = store.get(brand)["phones"]
+        if phone_id in rebuilt:
+            is_new = phone_id not in phones
+            phones[phone_id] = rebuilt[phone_id]
+            store.mark_dirty(brand, new_phones=int(is_new))
+        elif phones.pop(phone_id, None) is not None:
+            store.mark_dirty(brand)
+    store.flush()
+    METRICS.add("phones_rebuilt", len(ordered))
+    log_metrics("incremental rebuild", METRICS.end())
+
+    manifest["files"] = new_files
+    atomic_write_json(Path(INPUT_MANIFEST), manifest)
+
+    # Drop cached contributions that no manifest entry points at anymore
+    live = {entry["sha256"] for entry in new_files.values()}
+    for path in Path(PARTIALS_DIR).glob("*.json"):
+        if path.stem not in live:
+            path.unlink()
+
+    log(f"[INFO] incremental: {len(changed)} changed, {len(removed)} removed, "
+        f"{len(csv_files) - len(changed)} unchanged, {len(ordered)} phone records rebuilt.")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Merge Kaggle smartphone CSVs into one JSON per brand.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes (1 = serial, default)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="skip CSVs whose content hash is unchanged and rebuild only affected phones")
+    parser.add_argument("--no-aliases", action="store_true",
+                        help="ignore the alias table from Entity_Resolution.py")
+    parser.add_argument("--no-catalog", action="store_true",
+                        help="don't write the columnar (Parquet/Arrow) catalog after merging")
+    parser.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR"], default="INFO",
+                        help="lowest level written to the log (DEBUG adds per-file counters)")
+    parser.add_argument("--log-json", action="store_true",
+                        help="write the log file as JSON lines")
+    parser.add_argument("--storage", choices=list(FORMATS), default=None,
+                        help=f"brand file format (default: {STORAGE_FORMAT}); files in another format are converted as they are saved")
+    parser.add_argument("--sqlite", action="store_true",
+                        help="merge into the SQLite store (SQLITE_DB) instead of the brand files")
+    parser.add_argument("--export-json", action="store_true",
+                        help="with --sqlite: write the store out as brand files (in the --storage format)")
+    parser.add_argument("--no-snapshot", action="store_true",
+                        help="don't write the per-phone content hash snapshot / change list")
+    parser.add_argument("--no-metrics", action="store_true",
+                        help="don't time merge stages or log the per-file [STATS] lines")
+    return parser.parse_args(argv)
+
+def write_columnar_catalog(phones=None):
+    """
+    One-row-per-phone Parquet/Arrow copy of the brand JSON (or `phones`) for fast filtering (needs pyarrow).
+    """
+    try:
+        import pyarrow  # Catalog_Export only imports it once the table is built
+        from Catalog_Export import export_catalog
+    except ImportError as e:
+        log(f"[WARN] columnar catalog skipped: {e}")
+        return
+    n = export_catalog(OUTPUT_DIR, CATALOG_FILE, CANONICAL_KEYS, LIST_FIELDS, phones)
+    log(f"[OK] columnar catalog -> {n} phones written to {CATALOG_FILE}")
+
+def open_sqlite_store():
+    from Sqlite_Store import SqliteBrandStore
+
+    return SqliteBrandStore(SQLITE_DB, key=lambda brand: os.path.normcase(brand_file_stem(brand)),
+                            timer=METRICS.timer)
+
+def export_sqlite_store(store) -> int:
+    """
+    Write every brand of the SQLite store as a brand file (the layout a file-backed run writes).
+    Returns the number of files written.
+    """
+    n = 0
+    for db in store.iter_brands():
+        if db["phones"]:
+            save_brand_db(db["brand"], db)
+            n += 1
+        else:
+            delete_brand_db(db["brand"])
+    return n
+
+def write_phone_index():
+    """
+    Sidecar id / brand+model -> shard offset index (Phone_Index.py); jsonl storage only.
+    """
+    from Phone_Index import build_index
+
+    n = build_index(OUTPUT_DIR, PHONE_INDEX)
+    log(f"[OK] phone index -> {n} phones indexed in {PHONE_INDEX}")
+
+def write_catalog_snapshot(phones=None):
+    """
+    Content hash per phone id (Catalog_Snapshot.py) plus the ids added / removed /
+    changed since the previous run, for consumers that update incrementally.
+    """
+    from Catalog_Export import iter_catalog_phones
+    from Catalog_Snapshot import take_snapshot
+
+    path, changes = take_snapshot(iter_catalog_phones(OUTPUT_DIR) if phones is None else phones, SNAPSHOT_DIR)
+    if changes is None:
+        log(f"[OK] snapshot -> {path} (first snapshot, no change list)")
+    else:
+        log(f"[OK] snapshot -> {path} ({len(changes['added'])} added, {len(changes['removed'])} removed, "
+            f"{len(changes['changed'])} changed since {changes['previous']})")
+
+def main(argv=None):
+    global STORAGE_FORMAT
+    args = parse_args(argv)
+    STORAGE_FORMAT = args.storage or STORAGE_FORMAT
 
-def main():
     # fresh log
-    if os.path.exists(LOG_FILE):
-        os.remove(LOG_FILE)
+    start_log(args.log_level, args.log_json, fresh=True)
+    METRICS.reset(enabled=not args.no_metrics)
     log("=== Start merging Kaggle smartphone CSVs ===")
 
     # Find all CSVs recursively
@@ -390,12 +1195,48 @@ def main():
         log(f"[INFO] No CSV files found under: {INPUT_DIR}")
         return
 
-    for csv_path in csv_files:
-        log(f"--> {csv_path}")
-        process_csv_file(csv_path)
+    store = open_sqlite_store() if args.sqlite else BrandStore()
+    manifest = load_mapping_manifest()
+    aliases = {} if args.no_aliases else load_alias_table()
+    if aliases:
+        log(f"[INFO] alias table: {len(aliases)} near-duplicate ids map to canonical phones")
+    if args.incremental:
+        merge_incremental(csv_files, store, manifest, args.workers, aliases)
+    else:
+        if args.workers > 1:
+            merge_parallel(csv_files, store, manifest, args.workers, aliases)
+        else:
+            for csv_path in csv_files:
+                log(f"--> {csv_path}")
+                process_csv_file(csv_path, store, manifest, aliases)
+    # alias records left by earlier runs (an incremental run never lists them as affected)
+    if aliases and fold_aliases(store, aliases):
+        store.flush()
+
+    if manifest.pop("dirty", False):
+        save_mapping_manifest(manifest)
+
+    if args.sqlite:
+        store.flush()
+        log(f"[OK] SQLite store -> {SQLITE_DB}")
+        if args.export_json:
+            n = export_sqlite_store(store)
+            log(f"[OK] SQLite store exported -> {n} brand files in {OUTPUT_DIR}")
+
+    if not args.no_catalog:
+        write_columnar_catalog(store.iter_phones() if args.sqlite and not args.export_json else None)
+    if STORAGE_FORMAT == "jsonl" and (not args.sqlite or args.export_json):
+        write_phone_index()
+    if not args.no_snapshot:
+        write_catalog_snapshot(store.iter_phones() if args.sqlite and not args.export_json else None)
+    if args.sqlite:
+        store.close()
 
+    get_logger().log_summary("rows", unit="files")
+    log_metrics("total", METRICS.totals())
     log("=== Done. One JSON per brand has been written to OUTPUT_DIR ===")
     log(f"OUTPUT_DIR = {OUTPUT_DIR}")
+    get_logger().flush()
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,146 @@
 import pandas as pd
 import re
-import os
+import json
+import hashlib
+from collections import OrderedDict
+
+from Atomic_Write import atomic_path
+
+# Also run the scalar extract_brand_model_color on every row and report any row
+# where the column parser disagrees (slow; for checking changes to either)
+CHECK_COLUMN_PARSER = False
+
+# Parsed descriptions kept by a DescriptionCache (least recently used dropped first)
+DESCRIPTION_CACHE_SIZE = 200000
+
+# The compiled scalar matcher parses ~55k rows/s; the column parser is slower per text
+# (~25-35k/s) and only wins by parsing each distinct description once, so it is used for
+# long columns that repeat heavily (or with a DescriptionCache, whose hits only it can use)
+COLUMN_PARSER_MIN_ROWS = 5000
+COLUMN_PARSER_MAX_DISTINCT = 0.25   # distinct descriptions / rows (break-even is ~0.35)
+
+# Common smartphone brands (the first one in this order the text starts with wins)
+BRANDS = [
+    'Apple', 'Samsung', 'Redmi', 'Xiaomi', 'OnePlus', 'Oppo', 'Vivo', 
+    'Realme', 'Huawei', 'Honor', 'Nokia', 'Motorola', 'Google', 'Sony',
+    'LG', 'HTC', 'Asus', 'Nothing', 'iQOO', 'Poco', 'Mi', 'Infinix',
+    'Tecno', 'Lava', 'Micromax', 'Intex', 'Karbonn', 'Gionee', 'Lenovo',
+    'ZTE', 'Alcatel', 'BlackBerry', 'Meizu', 'LeEco', 'Coolpad', 'YU',
+    'InFocus', 'Panasonic', 'Celkon', 'Spice', 'Xolo', 'iBall', 'Swipe',
+    'Lyf', 'Jio', 'Airtel', 'BSNL', 'Idea', 'Vodafone', 'Reliance',
+    'Smartron', 'Ziox', 'Kult', 'Comio', 'Mobiistar', 'Nubia', 'Sharp',
+    'Fairphone', 'Essential', 'Razer', 'ROG', 'Legion', 'RedMagic',
+    'Black Shark', 'Gaming Phone', 'Rugged', 'CAT', 'Doogee', 'Ulefone',
+    'Oukitel', 'Blackview', 'Cubot', 'Elephone', 'Vernee', 'Bluboo',
+    'Homtom', 'Leagoo', 'Maze', 'Nomu', 'Poptel', 'Conquest', 'AGM',
+    'Crosscall', 'Kyocera', 'Sonim', 'Caterpillar', 'Land Rover'
+]
+
+# Common colors (case insensitive; the first one in this order found in the text wins)
+COLORS = [
+    'Black', 'White', 'Blue', 'Red', 'Green', 'Yellow', 'Pink', 'Purple',
+    'Gold', 'Silver', 'Rose Gold', 'Space Gray', 'Midnight', 'Starlight',
+    'Sky Blue', 'Sea Blue', 'Nature Green', 'Aqua Green', 'Coral',
+    'Graphite', 'Sierra Blue', 'Alpine Green', 'Deep Purple', 'Orange',
+    'Brown', 'Beige', 'Cream', 'Ivory', 'Pearl', 'Bronze', 'Copper',
+    'Champagne', 'Platinum', 'Titanium', 'Steel', 'Matte Black', 'Glossy Black',
+    'Jet Black', 'Carbon Black', 'Onyx', 'Obsidian', 'Coal', 'Charcoal',
+    'Pure White', 'Snow White', 'Pearl White', 'Frost White', 'Ceramic White',
+    'Ocean Blue', 'Navy Blue', 'Royal Blue', 'Electric Blue', 'Cobalt Blue',
+    'Teal', 'Turquoise', 'Cyan', 'Azure', 'Sapphire', 'Indigo',
+    'Crimson', 'Scarlet', 'Cherry Red', 'Wine Red', 'Burgundy', 'Maroon',
+    'Forest Green', 'Mint Green', 'Lime Green', 'Emerald', 'Jade', 'Olive',
+    'Hot Pink', 'Magenta', 'Fuchsia', 'Rose', 'Blush', 'Salmon',
+    'Lavender', 'Violet', 'Plum', 'Orchid', 'Lilac', 'Amethyst',
+    'Sunset Orange', 'Peach', 'Apricot', 'Tangerine', 'Amber', 'Honey',
+    'Lemon', 'Canary', 'Mustard', 'Saffron', 'Marigold', 'Sunflower',
+    'Gradient', 'Aurora', 'Prism', 'Rainbow', 'Holographic', 'Iridescent',
+    'Matte', 'Glossy', 'Satin', 'Metallic', 'Shimmer', 'Sparkle',
+    'Transparent', 'Clear', 'Frosted', 'Smoke', 'Haze', 'Mist'
+]
+
+# ---- Compiled matchers (built once at import) ----
+def build_trie(words):
+    """
+    Character trie over the lowercased words; a node's "" entry is the list index
+    of the first word ending there.
+    """
+    trie = {}
+    for i, word in enumerate(words):
+        node = trie
+        for ch in word.lower():
+            node = node.setdefault(ch, {})
+        node.setdefault("", i)
+    return trie
+
+def trie_regex(node) -> str:
+    """
+    Regex equivalent of a trie: one alternation per node, so matching at a position
+    costs a walk down the trie instead of a try per word. Greedy, so it matches the
+    longest word starting there.
+    """
+    branches = [re.escape(ch) + trie_regex(child) for ch, child in node.items() if ch]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return f"(?:{body})?" if "" in node else body
+
+BRAND_TRIE = build_trie(BRANDS)
+# column version: alternatives in list order, so the earliest listed brand wins like the loop
+BRAND_PREFIX_RE = re.compile("^(" + "|".join(re.escape(b.lower()) for b in BRANDS) + ")")
+BRAND_BY_LOWER = {}
+for b in BRANDS:
+    BRAND_BY_LOWER.setdefault(b.lower(), b)
+
+def match_brand(text_lower: str):
+    """
+    Same as the first b in BRANDS with text_lower.startswith(b.lower()): walk the
+    trie along the text and keep the earliest listed brand ending on the way.
+    """
+    node, best = BRAND_TRIE, None
+    for ch in text_lower:
+        node = node.get(ch)
+        if node is None:
+            break
+        i = node.get("")
+        if i is not None and (best is None or i < best):
+            best = i
+    return None if best is None else BRANDS[best]
+
+COLOR_TRIE = build_trie(COLORS)
+# every position in one scan; each hit is the longest color starting there
+COLOR_SCAN = re.compile("(?=(" + trie_regex(COLOR_TRIE) + "))")
+COLOR_INDEX = {}
+for i, c in enumerate(COLORS):
+    COLOR_INDEX.setdefault(c.lower(), i)
+# longest color at a position -> earliest listed color that starts there (one of its prefixes)
+COLOR_FIRST = {c: min(COLOR_INDEX[p] for p in COLOR_INDEX if c.startswith(p)) for c in COLOR_INDEX}
+COLOR_PATTERNS = {c: re.compile(re.escape(c), re.IGNORECASE) for c in COLORS}
+
+def match_color(text_lower: str):
+    """
+    Same as the first c in COLORS with c.lower() in text_lower.
+    """
+    found = COLOR_SCAN.findall(text_lower)
+    if not found:
+        return None
+    return COLORS[min(COLOR_FIRST[c] for c in found)]
+
+# Specification patterns stripped from the model
+PARENS_RE = re.compile(r'\([^)]*\)')
+BRACKETS_RE = re.compile(r'\[[^\]]*\]')
+SPEC_RES = [
+    re.compile(r'\d+GB.*'),
+    re.compile(r'\d+MP.*'),
+    re.compile(r'\d+mAh.*'),
+    re.compile(r'\|\s*.*'),  # Remove everything after |
+    re.compile(r'-.*'),      # Remove everything after -
+]
+TRAILING_PUNCT_RE = re.compile(r'[,\-\|].*')
+# SPEC_RES then TRAILING_PUNCT_RE in one pass: each cuts from its first match to the
+# end of the line, so applying them in turn cuts at the earliest one (single-line
+# text only: r'\|\s*' can run past a newline)
+SPEC_CUT_RE = re.compile('|'.join([p.pattern for p in SPEC_RES] + [TRAILING_PUNCT_RE.pattern]))
 
 def extract_brand_model_color(text):
     """
@@ -12,62 +152,14 @@ def extract_brand_model_color(text):
     
     text = str(text).strip()
     
-    # Common smartphone brands
-    brands = [
-        'Apple', 'Samsung', 'Redmi', 'Xiaomi', 'OnePlus', 'Oppo', 'Vivo', 
-        'Realme', 'Huawei', 'Honor', 'Nokia', 'Motorola', 'Google', 'Sony',
-        'LG', 'HTC', 'Asus', 'Nothing', 'iQOO', 'Poco', 'Mi', 'Infinix',
-        'Tecno', 'Lava', 'Micromax', 'Intex', 'Karbonn', 'Gionee', 'Lenovo',
-        'ZTE', 'Alcatel', 'BlackBerry', 'Meizu', 'LeEco', 'Coolpad', 'YU',
-        'InFocus', 'Panasonic', 'Celkon', 'Spice', 'Xolo', 'iBall', 'Swipe',
-        'Lyf', 'Jio', 'Airtel', 'BSNL', 'Idea', 'Vodafone', 'Reliance',
-        'Smartron', 'Ziox', 'Kult', 'Comio', 'Mobiistar', 'Nubia', 'Sharp',
-        'Fairphone', 'Essential', 'Razer', 'ROG', 'Legion', 'RedMagic',
-        'Black Shark', 'Gaming Phone', 'Rugged', 'CAT', 'Doogee', 'Ulefone',
-        'Oukitel', 'Blackview', 'Cubot', 'Elephone', 'Vernee', 'Bluboo',
-        'Homtom', 'Leagoo', 'Maze', 'Nomu', 'Poptel', 'Conquest', 'AGM',
-        'Crosscall', 'Kyocera', 'Sonim', 'Caterpillar', 'Land Rover'
-    ]
-    
-    # Common colors (case insensitive)
-    colors = [
-        'Black', 'White', 'Blue', 'Red', 'Green', 'Yellow', 'Pink', 'Purple',
-        'Gold', 'Silver', 'Rose Gold', 'Space Gray', 'Midnight', 'Starlight',
-        'Sky Blue', 'Sea Blue', 'Nature Green', 'Aqua Green', 'Coral',
-        'Graphite', 'Sierra Blue', 'Alpine Green', 'Deep Purple', 'Orange',
-        'Brown', 'Beige', 'Cream', 'Ivory', 'Pearl', 'Bronze', 'Copper',
-        'Champagne', 'Platinum', 'Titanium', 'Steel', 'Matte Black', 'Glossy Black',
-        'Jet Black', 'Carbon Black', 'Onyx', 'Obsidian', 'Coal', 'Charcoal',
-        'Pure White', 'Snow White', 'Pearl White', 'Frost White', 'Ceramic White',
-        'Ocean Blue', 'Navy Blue', 'Royal Blue', 'Electric Blue', 'Cobalt Blue',
-        'Teal', 'Turquoise', 'Cyan', 'Azure', 'Sapphire', 'Indigo',
-        'Crimson', 'Scarlet', 'Cherry Red', 'Wine Red', 'Burgundy', 'Maroon',
-        'Forest Green', 'Mint Green', 'Lime Green', 'Emerald', 'Jade', 'Olive',
-        'Hot Pink', 'Magenta', 'Fuchsia', 'Rose', 'Blush', 'Salmon',
-        'Lavender', 'Violet', 'Plum', 'Orchid', 'Lilac', 'Amethyst',
-        'Sunset Orange', 'Peach', 'Apricot', 'Tangerine', 'Amber', 'Honey',
-        'Lemon', 'Canary', 'Mustard', 'Saffron', 'Marigold', 'Sunflower',
-        'Gradient', 'Aurora', 'Prism', 'Rainbow', 'Holographic', 'Iridescent',
-        'Matte', 'Glossy', 'Satin', 'Metallic', 'Shimmer', 'Sparkle',
-        'Transparent', 'Clear', 'Frosted', 'Smoke', 'Haze', 'Mist'
-    ]
-    
-    brand = None
     model = None
-    color = None
     
     # Extract brand (usually at the beginning)
-    for b in brands:
-        if text.lower().startswith(b.lower()):
-            brand = b
-            break
+    text_lower = text.lower()
+    brand = match_brand(text_lower)
     
     # Extract color (look for color keywords)
-    text_lower = text.lower()
-    for c in colors:
-        if c.lower() in text_lower:
-            color = c
-            break
+    color = match_color(text_lower)
     
     # Extract model (everything after brand, before color or specifications)
     if brand:
@@ -83,22 +175,18 @@ def extract_brand_model_color(text):
         
         # Remove color from the end if found
         if color:
-            color_pattern = re.compile(re.escape(color), re.IGNORECASE)
-            remaining = color_pattern.sub('', remaining).strip()
+            remaining = COLOR_PATTERNS[color].sub('', remaining).strip()
         
         # Remove specifications in parentheses and brackets
-        remaining = re.sub(r'\([^)]*\)', '', remaining)
-        remaining = re.sub(r'\[[^\]]*\]', '', remaining)
+        remaining = PARENS_RE.sub('', remaining)
+        remaining = BRACKETS_RE.sub('', remaining)
         
         # Remove common specification patterns
-        remaining = re.sub(r'\d+GB.*', '', remaining)
-        remaining = re.sub(r'\d+MP.*', '', remaining)
-        remaining = re.sub(r'\d+mAh.*', '', remaining)
-        remaining = re.sub(r'\|\s*.*', '', remaining)  # Remove everything after |
-        remaining = re.sub(r'-.*', '', remaining)      # Remove everything after -
+        for spec_re in SPEC_RES:
+            remaining = spec_re.sub('', remaining)
         
         # Clean up extra spaces and punctuation
-        remaining = re.sub(r'[,\-\|].*', '', remaining)
+        remaining = TRAILING_PUNCT_RE.sub('', remaining)
         remaining = remaining.strip(' ,.-')
         
         if model_prefix:
@@ -125,11 +213,10 @@ def extract_brand_model_color(text):
                 if remaining_words:
                     model_part = ' '.join(remaining_words)
                     # Clean model similar to above
-                    model_part = re.sub(r'\([^)]*\)', '', model_part)
-                    model_part = re.sub(r'\[[^\]]*\]', '', model_part)
+                    model_part = PARENS_RE.sub('', model_part)
+                    model_part = BRACKETS_RE.sub('', model_part)
                     if color:
-                        color_pattern = re.compile(re.escape(color), re.IGNORECASE)
-                        model_part = color_pattern.sub('', model_part).strip()
+                        model_part = COLOR_PATTERNS[color].sub('', model_part).strip()
                     model_part = model_part.strip(' ,.-')
                     
                     # Concatenate brand + model for the model column
@@ -141,6 +228,211 @@ def extract_brand_model_color(text):
     
     return brand, model, color
 
+def strip_color(part: pd.Series, color: pd.Series) -> pd.Series:
+    """
+    Remove each row's own color (case insensitive) and strip. The pattern differs
+    per row, so this one step is a plain loop over precompiled patterns.
+    """
+    return pd.Series([COLOR_PATTERNS[c].sub('', p).strip() if c else p
+                      for p, c in zip(part, color[part.index])], index=part.index, dtype=object)
+
+def join_brand_model(brand: pd.Series, model_part: pd.Series) -> pd.Series:
+    # Concatenate brand + model for the model column (Apple models stand alone)
+    model = (brand + " " + model_part).str.strip()
+    apple = brand == "Apple"
+    model[apple] = model_part[apple].str.strip()
+    return model
+
+def parse_descriptions(text: pd.Series) -> pd.DataFrame:
+    """
+    brand_name / model / color (NaN for none) of stripped, non-empty description texts.
+    """
+    lower = text.str.lower()
+
+    brand = lower.str.extract(BRAND_PREFIX_RE, expand=False).map(BRAND_BY_LOWER)
+    # one COLOR_SCAN per row, earliest listed color among the hits
+    color = lower.map(match_color)
+    model = pd.Series(None, index=text.index, dtype=object)
+
+    # Known brand: cut it off, then strip color and specifications
+    known = brand.notna()
+    remaining = pd.Series([t[len(b):] for t, b in zip(text[known], brand[known])],
+                          index=text.index[known], dtype=object).str.strip()
+    apple = remaining[brand[known] == 'Apple']
+    iphone = apple.index[apple.str.lower().str.startswith('iphone')]
+    remaining[iphone] = remaining[iphone].str[6:].str.strip()
+    remaining = strip_color(remaining, color)
+    remaining = remaining.str.replace(PARENS_RE, '', regex=True).str.replace(BRACKETS_RE, '', regex=True)
+    multiline = remaining.str.contains('\n', regex=False)
+    remaining[~multiline] = remaining[~multiline].str.replace(SPEC_CUT_RE, '', regex=True)
+    for pattern in SPEC_RES + [TRAILING_PUNCT_RE]:
+        remaining[multiline] = remaining[multiline].str.replace(pattern, '', regex=True)
+    remaining = remaining.str.strip(' ,.-')
+    model_part = remaining.str.strip()
+    model_part[iphone] = ("iPhone " + remaining[iphone]).str.strip()
+    model[known] = join_brand_model(brand[known], model_part)
+
+    # No known brand: a title-case first word (3+ letters) becomes the brand
+    words = text[~known].str.split()
+    first = words.str[0]
+    guessed = first.notna() & (first.str.istitle() == True) & (first.str.len() > 2)
+    brand[guessed[guessed].index] = first[guessed]
+    with_model = guessed & (words.str.len() > 1)
+    model_part = words[with_model].str[1:].str.join(' ')
+    model_part = model_part.str.replace(PARENS_RE, '', regex=True).str.replace(BRACKETS_RE, '', regex=True)
+    model_part = strip_color(model_part, color).str.strip(' ,.-')
+    model[model_part.index] = join_brand_model(first[model_part.index], model_part)
+    return pd.DataFrame({'brand_name': brand, 'model': model, 'color': color})
+
+def extract_brand_model_color_column(descriptions: pd.Series, cache: "DescriptionCache | None" = None) -> pd.DataFrame:
+    """
+    Column version of extract_brand_model_color: the same (brand_name, model, color)
+    for every row, in a few .str passes over the whole column. Each distinct
+    description is parsed once; with a cache, only the ones it doesn't hold yet.
+    Check it against the scalar function with check_column_parser().
+    """
+    original_index = descriptions.index
+    descriptions = descriptions.reset_index(drop=True)
+    valid = descriptions.notna() & descriptions.where(descriptions.notna(), "").astype(bool)
+    text = descriptions[valid].astype(str).str.strip()
+
+    parsed = {}
+    unique = text.unique()
+    if cache is not None:
+        for key in unique:
+            hit = cache.get(key)
+            if hit is not None:
+                parsed[key] = hit
+    missing = [key for key in unique if key not in parsed]
+    if missing:
+        new = parse_descriptions(pd.Series(missing, dtype=object))
+        for key, row in zip(missing, new.itertuples(index=False, name=None)):
+            row = tuple(None if pd.isna(v) else v for v in row)
+            parsed[key] = row
+            if cache is not None:
+                cache.put(key, row)
+    if cache is not None:
+        cache.record(lookups=len(text), parsed=len(missing))
+
+    result = pd.DataFrame([parsed[key] for key in text], index=text.index,
+                          columns=['brand_name', 'model', 'color'], dtype=object).reindex(descriptions.index)
+    result = result.astype(object).where(result.notna(), None)
+    result.index = original_index
+    return result
+
+def extract_brand_model_color_rows(descriptions: pd.Series) -> pd.DataFrame:
+    """
+    brand_name / model / color columns from extract_brand_model_color on every row.
+    """
+    return pd.DataFrame([extract_brand_model_color(text) for text in descriptions], index=descriptions.index,
+                        columns=['brand_name', 'model', 'color'], dtype=object)
+
+def extract_brand_model_color_frame(descriptions: pd.Series, cache: "DescriptionCache | None" = None) -> pd.DataFrame:
+    """
+    brand_name / model / color columns the fastest way for this column: the scalar
+    matcher row by row, or the column parser when a cache is given or the column
+    is long and repeats heavily (see COLUMN_PARSER_MIN_ROWS). Both give the same result.
+    """
+    if cache is not None or (len(descriptions) >= COLUMN_PARSER_MIN_ROWS and
+                             descriptions.nunique() <= COLUMN_PARSER_MAX_DISTINCT * len(descriptions)):
+        return extract_brand_model_color_column(descriptions, cache)
+    return extract_brand_model_color_rows(descriptions)
+
+def check_column_parser(descriptions: pd.Series, columns: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Rows where extract_brand_model_color_column() differs from the scalar
+    extract_brand_model_color() (empty when they agree).
+    """
+    if columns is None:
+        columns = extract_brand_model_color_column(descriptions)
+    expected = [extract_brand_model_color(text) for text in descriptions]
+    got = list(columns[['brand_name', 'model', 'color']].itertuples(index=False, name=None))
+    differs = [e != g for e, g in zip(expected, got)]
+    out = columns[differs].copy()
+    out.insert(0, 'description', descriptions[differs])
+    out['expected'] = [e for e, d in zip(expected, differs) if d]
+    return out
+
+# ---- Memoized parsing ----
+def parser_fingerprint() -> str:
+    # this file's source: any change to the lists or the parsing invalidates saved parses
+    with open(__file__, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+class DescriptionCache:
+    """
+    Bounded LRU of parsed descriptions: stripped description text -> (brand, model, color).
+    The stripped text is all extract_brand_model_color looks at, so a hit is exactly
+    what parsing would return. save() / load() keep it in a JSON file between runs;
+    a file written by another version of this module is ignored.
+    """
+    def __init__(self, max_entries: int = DESCRIPTION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.added = []  # entries parsed here since the last take_added()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key: str):
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def _store(self, key: str, value: tuple):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def put(self, key: str, value: tuple):
+        self._store(key, value)
+        self.added.append((key, value))
+
+    def merge(self, entries):
+        """
+        Add entries parsed elsewhere (another process's take_added()).
+        """
+        for key, value in entries:
+            self._store(key, tuple(value))
+
+    def take_added(self) -> list:
+        added, self.added = self.added, []
+        return added
+
+    def record(self, lookups: int, parsed: int):
+        # every row that didn't need parsing counts as a hit (repeats within a file too)
+        self.hits += lookups - parsed
+        self.misses += parsed
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def load(self, path: str) -> int:
+        """
+        Entries read from `path` (0 when it is missing, unreadable or from another parser version).
+        """
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if saved.get("parser") != parser_fingerprint():
+            return 0
+        self.merge(saved.get("entries", []))
+        return len(saved.get("entries", []))
+
+    def save(self, path: str):
+        with atomic_path(path) as tmp_path:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"parser": parser_fingerprint(), "entries": [[k, list(v)] for k, v in self.entries.items()]},
+                          f, ensure_ascii=False)
+
 # def modify_amazon_csv():
 #     """Modify Amazon Top Rated Smartphones CSV file"""
 #     file_path = r"e:\BenchSmart\Test Programs\kaggle_datasets\smartphones.csv"
@@ -181,12 +473,17 @@ def modify_iphone_csv():
     df = pd.read_csv(file_path)
     
     # Extract brand, model, color from Description column
-    extracted_data = df['Description'].apply(extract_brand_model_color)
+    extracted_data = extract_brand_model_color_frame(df['Description'])
+    if CHECK_COLUMN_PARSER:
+        mismatches = check_column_parser(df['Description'])
+        print(f"Column parser check: {len(mismatches)} of {len(df)} rows differ from extract_brand_model_color")
+        if len(mismatches):
+            print(mismatches.head(20).to_string())
     
     # Create new columns
-    df['brand_name'] = [x[0] for x in extracted_data]
-    df['model'] = [x[1] for x in extracted_data]
-    df['color'] = [x[2] for x in extracted_data]
+    df['brand_name'] = extracted_data['brand_name']
+    df['model'] = extracted_data['model']
+    df['color'] = extracted_data['color']
     
     # Drop the original Description column
     df = df.drop('Description', axis=1)
@@ -0,0 +1,224 @@
+import os
+import json
+import glob
+import time
+import fnmatch
+import argparse
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from Atomic_Write import atomic_path
+from Modify_CSV_Columns import (DESCRIPTION_CACHE_SIZE, DescriptionCache, check_column_parser,
+                                extract_brand_model_color_frame)
+
+# === CONFIG ===
+INPUT_DIRS = [
+    r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Datasets",
+    r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Opendatabay_Datasets",
+]
+# Outputs go to OUTPUT_DIR/<input dir name>/..., outside the merge's INPUT_DIR, so a
+# merge never ingests a raw CSV and its normalized copy side by side
+OUTPUT_DIR = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Normalized_Datasets"
+RULES_FILE = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Normalize_CSV_Rules.json"
+# Parsed descriptions kept between runs (a nightly run only parses descriptions it hasn't seen)
+CACHE_FILE = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Dataset_JSON\Cache\description_cache.json"
+
+# Rules file (JSON):
+#   "output": "{stem}_modified.csv"         output file name ({stem} = name without .csv)
+#   "datasets": [                           the first rule whose "match" glob fits the file name is used
+#     {"match": "iphone_results*.csv",
+#      "read_csv": {"encoding": "latin-1"}, optional pandas.read_csv arguments
+#      "parse": {"column": "Description",   parse one column into new ones (skipped if the CSV lacks it)
+#                "parser": "brand_model_color", "into": ["brand_name", "model", "color"]},
+#      "rename": {"old": "new"},            optional
+#      "drop": ["Description"],             optional (missing columns are ignored)
+#      "order": ["brand_name", "model"]}]   these columns first, the rest after in their current order
+# CSVs that match no rule, and files named like outputs (e.g. the iphone_results_modified.csv
+# Modify_CSV_Columns writes), are left alone.
+
+# Column parsers a rule can name: Series -> DataFrame of new columns, and the check
+# that compares it with its scalar version row by row (--check)
+PARSERS = {
+    "brand_model_color": (extract_brand_model_color_frame, check_column_parser),
+}
+
+def load_rules(path: str = RULES_FILE) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        rules = json.load(f)
+    rules.setdefault("output", "{stem}_modified.csv")
+    for rule in rules.get("datasets", []):
+        parse = rule.get("parse")
+        if parse and parse.get("parser") not in PARSERS:
+            raise ValueError(f"rule {rule.get('match')!r}: unknown parser {parse.get('parser')!r} "
+                             f"(known: {', '.join(PARSERS)})")
+    return rules
+
+def output_path(csv_path: str, input_dir: str, rules: dict, output_dir: str = OUTPUT_DIR) -> str:
+    """
+    Where a CSV's output goes: OUTPUT_DIR/<input dir name>/<sub dirs>/<output name>
+    (both input dirs have a Smartphone_Evolution.csv).
+    """
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    sub_dir = os.path.relpath(os.path.dirname(csv_path), input_dir)
+    return os.path.normpath(os.path.join(output_dir, os.path.basename(os.path.normpath(input_dir)), sub_dir,
+                                         rules["output"].format(stem=stem)))
+
+def find_jobs(input_dirs: list[str], rules: dict, output_dir: str = OUTPUT_DIR) -> tuple[list, list]:
+    """
+    ([(csv_path, rule, output_path)], [(csv_path, reason)]) over every CSV under the input dirs,
+    in path order.
+    """
+    outputs = rules["output"].format(stem="*")
+    output_root = os.path.join(os.path.abspath(output_dir), "")
+    jobs, skipped = [], []
+    for input_dir in input_dirs:
+        for path in sorted(glob.glob(os.path.join(input_dir, "**", "*.csv"), recursive=True)):
+            name = os.path.basename(path)
+            if fnmatch.fnmatch(name, outputs) or os.path.abspath(path).startswith(output_root):
+                continue
+            rule = next((r for r in rules.get("datasets", []) if fnmatch.fnmatch(name, r["match"])), None)
+            if rule is None:
+                skipped.append((path, "no rule"))
+            else:
+                jobs.append((path, rule, output_path(path, input_dir, rules, output_dir)))
+    return jobs, skipped
+
+# ---- Description cache ----
+# One per process, shared by every CSV that process normalizes. Workers start from
+# the saved file and hand what they parse back to the parent, which saves it.
+CACHE = None
+
+def open_cache(path: str | None = None, max_entries: int = DESCRIPTION_CACHE_SIZE) -> DescriptionCache:
+    global CACHE
+    CACHE = DescriptionCache(max_entries) if max_entries > 0 else None
+    if CACHE is not None and path:
+        CACHE.load(path)
+    return CACHE
+
+# ---- One CSV (runs in a worker) ----
+def apply_rule(df: pd.DataFrame, rule: dict, check: bool = False) -> tuple[pd.DataFrame, str | None]:
+    """
+    The normalized frame, and the number of rows the --check found different (as text) or None.
+    """
+    checked = None
+    parse = rule.get("parse")
+    if parse:
+        parser, check_parser = PARSERS[parse["parser"]]
+        parsed = parser(df[parse["column"]], cache=CACHE)
+        into = parse.get("into") or list(parsed.columns)
+        if len(into) != len(parsed.columns):
+            raise ValueError(f"parser {parse['parser']} gives {len(parsed.columns)} columns, 'into' names {len(into)}")
+        if check:
+            checked = f"{len(check_parser(df[parse['column']], parsed))} rows differ from the scalar parser"
+        for name, column in zip(into, parsed.columns):
+            df[name] = parsed[column]
+    if rule.get("rename"):
+        df = df.rename(columns=rule["rename"])
+    if rule.get("drop"):
+        df = df.drop(columns=rule["drop"], errors="ignore")
+    if rule.get("order"):
+        first = [c for c in rule["order"] if c in df.columns]
+        df = df[first + [c for c in df.columns if c not in first]]
+    return df, checked
+
+def normalize_csv(csv_path: str, rule: dict, output: str, check: bool = False) -> dict:
+    """
+    Normalize one CSV by its rule and write the output atomically.
+    Returns {"status": "ok" | "skip" | "error", "output", "rows", "message", "seconds",
+    "cache_hits", "cache_misses", "cache_added"} (the last three from this CSV's parsing).
+    """
+    start = time.perf_counter()
+    result = {"status": "ok", "output": output, "rows": 0, "message": ""}
+    hits, misses = (CACHE.hits, CACHE.misses) if CACHE is not None else (0, 0)
+    try:
+        df = pd.read_csv(csv_path, **rule.get("read_csv", {}))
+        parse = rule.get("parse")
+        if parse and parse["column"] not in df.columns:
+            result.update(status="skip", message=f"no '{parse['column']}' column")
+        else:
+            df, checked = apply_rule(df, rule, check)
+            with atomic_path(result["output"]) as tmp_path:
+                df.to_csv(tmp_path, index=False)
+            result.update(rows=len(df), message=checked or "")
+    except Exception as e:
+        result.update(status="error", message=f"{type(e).__name__}: {e}")
+    if CACHE is not None:
+        result.update(cache_hits=CACHE.hits - hits, cache_misses=CACHE.misses - misses,
+                      cache_added=CACHE.take_added())
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def normalize_all(jobs: list, workers: int = 1, check: bool = False,
+                  cache_file: str | None = None, cache_size: int = DESCRIPTION_CACHE_SIZE):
+    """
+    Yield (csv_path, normalize_csv result) in job order, using a process pool if workers > 1.
+    Every process starts from the parses saved in `cache_file`; what the workers
+    parse is merged into this process's CACHE (the caller saves it).
+    """
+    paths, rule_list, outputs = (list(column) for column in zip(*jobs)) if jobs else ([], [], [])
+    cache = open_cache(cache_file, cache_size)
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=open_cache,
+                                 initargs=(cache_file, cache_size)) as pool:
+            for path, result in zip(paths, pool.map(normalize_csv, paths, rule_list, outputs, repeat(check))):
+                if cache is not None:
+                    cache.merge(result.get("cache_added", []))
+                yield path, result
+    else:
+        for path, rule, output in jobs:
+            yield path, normalize_csv(path, rule, output, check)
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalize the raw dataset CSVs by a rules file before merging.")
+    parser.add_argument("--rules", default=RULES_FILE, help="rules file (JSON)")
+    parser.add_argument("--dirs", nargs="+", default=INPUT_DIRS, help="directories searched for CSVs (recursively)")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR,
+                        help="where the normalized CSVs are written (keep it outside the merge's INPUT_DIR)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (1 = serial)")
+    parser.add_argument("--check", action="store_true",
+                        help="also run the scalar parser on every row and report disagreements")
+    parser.add_argument("--verbose", action="store_true", help="also list the CSVs without a rule")
+    parser.add_argument("--cache-file", default=CACHE_FILE, help="parsed descriptions kept between runs")
+    parser.add_argument("--no-cache-file", action="store_true", help="don't read or write --cache-file")
+    parser.add_argument("--cache-size", type=int, default=DESCRIPTION_CACHE_SIZE,
+                        help="most descriptions kept in memory (0 = no cache)")
+    args = parser.parse_args()
+    cache_file = None if args.no_cache_file else args.cache_file
+
+    rules = load_rules(args.rules)
+    jobs, skipped = find_jobs(args.dirs, rules, args.output_dir)
+    if args.verbose:
+        for path, reason in skipped:
+            print(f"[SKIP] {path}: {reason}")
+
+    start = time.perf_counter()
+    failed = hits = misses = 0
+    for path, result in normalize_all(jobs, args.workers, args.check, cache_file, args.cache_size):
+        file_hits, file_misses = result.get("cache_hits", 0), result.get("cache_misses", 0)
+        hits, misses = hits + file_hits, misses + file_misses
+        if result["status"] == "ok":
+            notes = [result["message"]] if result["message"] else []
+            if file_hits + file_misses:
+                notes.append(f"cache hit rate {file_hits / (file_hits + file_misses):.0%}")
+            note = f" ({'; '.join(notes)})" if notes else ""
+            print(f"[OK] {path} -> {result['output']}: {result['rows']} rows in {result['seconds']:.2f}s{note}")
+        elif result["status"] == "skip":
+            print(f"[SKIP] {path}: {result['message']}")
+        else:
+            failed += 1
+            print(f"[WARN] {path}: {result['message']}")
+    print(f"[INFO] {len(jobs)} CSVs matched a rule ({failed} failed), {len(skipped)} without a rule; "
+          f"{time.perf_counter() - start:.2f}s with {args.workers} workers")
+    if CACHE is not None:
+        rate = hits / (hits + misses) if hits + misses else 0.0
+        print(f"[STATS] description cache: {hits + misses} lookups, {rate:.1%} hits, {len(CACHE)} entries")
+        if cache_file:
+            CACHE.save(cache_file)
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
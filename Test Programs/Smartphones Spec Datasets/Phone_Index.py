@@ -0,0 +1,232 @@
+import os
+import json
+import mmap
+import hashlib
+import argparse
+
+import numpy as np
+
+from Atomic_Write import atomic_path
+from Brand_Shards import OUTPUT_DIR, brand_files, format_of
+from Phone_Record import PhoneRecord
+
+# === CONFIG ===
+INDEX_FILE = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Dataset_JSON\Index\phone_index.npy"
+
+# One row per lookup key, sorted by key; file is a number into the sidecar's file list.
+# Only plain .jsonl shards are indexed: compressed shards and .json documents have no
+# byte offset a record can be read back from without decoding everything before it.
+ENTRY = np.dtype([("key", "<u8"), ("file", "<u4"), ("offset", "<u8"), ("length", "<u4")])
+
+def meta_path(index_path: str) -> str:
+    return os.path.splitext(index_path)[0] + ".json"
+
+# ---- Keys ----
+def brand_model_key(brand: str, model: str) -> str:
+    # same normalization as Merge_Kaggle_Datasets.stable_phone_id
+    return f"{brand.strip().lower()}|{model.strip().lower()}"
+
+def key_hash(kind: str, key: str) -> int:
+    """
+    64-bit lookup key; kind is "id" (phone id) or "bm" (brand_model_key).
+    """
+    return int.from_bytes(hashlib.blake2b(f"{kind}:{key}".encode("utf-8"), digest_size=8).digest(), "little")
+
+# ---- Building ----
+def scan_shard(path: str) -> list[tuple]:
+    """
+    (key, offset, length) of the live line of every phone in a .jsonl shard, two
+    keys per phone (id and brand+model). Same rules as Brand_Shards.read_shard.
+    """
+    live = {}  # phone id -> (offset, length, brand+model key)
+    offset = 0
+    with open(path, "rb") as f:
+        for line in f:
+            start, offset = offset, offset + len(line)
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                continue
+            if "id" not in obj:
+                continue
+            if obj.get("deleted"):
+                live.pop(obj["id"], None)
+            else:
+                live[obj["id"]] = (start, len(line.rstrip(b"\r\n")), brand_model_key(obj["brand"], obj["model"]))
+    rows = []
+    for phone_id, (start, length, bm) in live.items():
+        rows.append((key_hash("id", phone_id), start, length))
+        rows.append((key_hash("bm", bm), start, length))
+    return rows
+
+def file_signature(path: str) -> dict:
+    st = os.stat(path)
+    return {"name": os.path.basename(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+def load_meta(index_path: str) -> dict | None:
+    try:
+        with open(meta_path(index_path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def load_entries(index_path: str, meta: dict) -> np.ndarray:
+    # np.load can't memory-map a zero-length array
+    if not meta["entries"]:
+        return np.empty(0, dtype=ENTRY)
+    return np.load(index_path, mmap_mode="r")
+
+def build_index(output_dir: str = OUTPUT_DIR, index_path: str = INDEX_FILE) -> int:
+    """
+    (Re)write the sidecar index over every .jsonl shard in `output_dir`. Shards whose
+    size and mtime match the previous index keep their entries; only the others are
+    scanned. Returns the number of phones indexed.
+    """
+    shards = [p for p in brand_files(output_dir) if format_of(p) == "jsonl"]
+    files = [file_signature(p) for p in shards]
+
+    old_meta = load_meta(index_path)
+    old_numbers = {}
+    old = None
+    if old_meta is not None and os.path.exists(index_path):
+        old_numbers = {(f["name"], f["size"], f["mtime_ns"]): n for n, f in enumerate(old_meta["files"])}
+        old = load_entries(index_path, old_meta)
+        if len(old) != old_meta["entries"]:
+            old, old_numbers = None, {}
+
+    parts = []
+    for n, (path, sig) in enumerate(zip(shards, files)):
+        reused = old_numbers.get((sig["name"], sig["size"], sig["mtime_ns"]))
+        if old is not None and reused is not None:
+            part = np.array(old[old["file"] == reused])
+        else:
+            rows = scan_shard(path)
+            part = np.empty(len(rows), dtype=ENTRY)
+            if rows:
+                part["key"], part["offset"], part["length"] = zip(*rows)
+        part["file"] = n
+        parts.append(part)
+    entries = np.concatenate(parts) if parts else np.empty(0, dtype=ENTRY)
+    entries = entries[np.argsort(entries["key"], kind="stable")]
+    del old
+
+    # entries first, then the sidecar that points at them (both atomically)
+    with atomic_path(index_path) as tmp_path:
+        with open(tmp_path, "wb") as f:
+            np.save(f, entries)
+    meta = {"version": 1, "output_dir": os.path.abspath(output_dir), "entries": len(entries), "files": files}
+    with atomic_path(meta_path(index_path)) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+    return len(entries) // 2
+
+# ---- Lazy loading ----
+class PhoneIndex:
+    """
+    Random access to single phones: the index is memory-mapped, each shard is
+    memory-mapped on first use and only the requested line is decoded.
+    Shards that changed after the index was built are rescanned on first lookup;
+    brand files added since then need a build_index() run. Close the index before
+    a merge rewrites the shards (Windows can't replace a mapped file).
+    """
+    def __init__(self, index_path: str = INDEX_FILE, output_dir: str | None = None):
+        meta = load_meta(index_path)
+        if meta is None:
+            raise FileNotFoundError(f"no phone index at {index_path}")
+        self.output_dir = output_dir or meta["output_dir"]
+        self.files = meta["files"]
+        self.entries = load_entries(index_path, meta)
+        self.keys = self.entries["key"]
+        self._maps = {}    # file number -> mmap
+        self._changed = {n for n, f in enumerate(self.files) if self._signature(n) != f}
+        self._rescanned = {}   # changed file number -> {key: [(offset, length)]}
+
+    def __len__(self) -> int:
+        return len(self.entries) // 2
+
+    def _path(self, n: int) -> str:
+        return os.path.join(self.output_dir, self.files[n]["name"])
+
+    def _signature(self, n: int) -> dict | None:
+        try:
+            return file_signature(self._path(n))
+        except OSError:
+            return None
+
+    def _shard(self, n: int) -> mmap.mmap:
+        m = self._maps.get(n)
+        if m is None:
+            with open(self._path(n), "rb") as f:
+                m = self._maps[n] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return m
+
+    def _rescan(self, n: int) -> dict:
+        found = self._rescanned.get(n)
+        if found is None:
+            found = self._rescanned[n] = {}
+            if os.path.exists(self._path(n)):
+                for key, offset, length in scan_shard(self._path(n)):
+                    found.setdefault(key, []).append((offset, length))
+        return found
+
+    def _candidates(self, key: int):
+        lo = np.searchsorted(self.keys, key, side="left")
+        hi = np.searchsorted(self.keys, key, side="right")
+        for row in self.entries[lo:hi]:
+            n = int(row["file"])
+            if n not in self._changed:
+                yield self._shard(n), int(row["offset"]), int(row["length"])
+        for n in self._changed:
+            for offset, length in self._rescan(n).get(key, ()):
+                yield self._shard(n), offset, length
+
+    def _lookup(self, key: int, matches) -> PhoneRecord | None:
+        for m, offset, length in self._candidates(key):
+            phone = json.loads(m[offset:offset + length])
+            if matches(phone):  # 64-bit keys can collide; the record decides
+                return PhoneRecord.from_dict(phone)
+        return None
+
+    def get(self, phone_id: str) -> PhoneRecord | None:
+        """
+        The phone with this id; an id found in several brand files (brand spellings
+        that map to different files) comes from the first file in path order.
+        """
+        return self._lookup(key_hash("id", phone_id), lambda p: p.get("id") == phone_id)
+
+    def find(self, brand: str, model: str) -> PhoneRecord | None:
+        bm = brand_model_key(brand, model)
+        return self._lookup(key_hash("bm", bm),
+                            lambda p: "brand" in p and brand_model_key(p["brand"], p["model"]) == bm)
+
+    def close(self):
+        for m in self._maps.values():
+            m.close()
+        self._maps.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the phone offset index or look a phone up through it.")
+    parser.add_argument("--dir", default=OUTPUT_DIR, help="directory holding the .jsonl brand shards")
+    parser.add_argument("--index", default=INDEX_FILE, help="index file (.npy; a .json sidecar sits next to it)")
+    parser.add_argument("--id", default=None, help="look up this phone id")
+    parser.add_argument("--brand", default=None, help="look up by brand and --model")
+    parser.add_argument("--model", default=None)
+    args = parser.parse_args()
+
+    if args.id is None and args.model is None:
+        n = build_index(args.dir, args.index)
+        print(f"Phone index over {n} phones written to: {args.index}")
+        return
+    with PhoneIndex(args.index, args.dir) as index:
+        phone = index.get(args.id) if args.id else index.find(args.brand or "", args.model)
+    print(json.dumps(phone.to_dict() if phone else None, ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
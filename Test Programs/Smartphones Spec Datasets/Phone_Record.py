@@ -0,0 +1,184 @@
+import sys
+from collections.abc import MutableMapping
+
+# Strings up to this length are interned when stored (OS names, chipsets, colors, units ...)
+INTERN_MAX_LEN = 64
+# Repeated numbers (5000 mAh, 6.5 inch, 128 GB ...) share one object, up to this many distinct ones
+NUMBER_CACHE_SIZE = 100000
+
+# one cache per type: 1, 1.0 and True are equal dict keys
+_numbers = {int: {}, float: {}}
+
+def _intern_item(v):
+    t = type(v)
+    if t is str:
+        return sys.intern(v) if len(v) <= INTERN_MAX_LEN else v
+    if (t is int or t is float) and v == v:
+        cache = _numbers[t]
+        shared = cache.get(v)
+        if shared is None:
+            if len(cache) >= NUMBER_CACHE_SIZE:
+                return v
+            shared = cache[v] = v
+        return shared
+    return v
+
+def intern_value(v):
+    if isinstance(v, list):
+        v[:] = [_intern_item(x) for x in v]
+        return v
+    return _intern_item(v)
+
+# ---- Shapes: one shared key layout per distinct attribute key sequence ----
+class Shape:
+    """
+    An interned tuple of attribute keys with its key -> slot index. Records that
+    got the same keys in the same order share one Shape, so each record only
+    stores its values. Adding a key follows a cached transition to the next Shape.
+    """
+    __slots__ = ("keys", "index", "transitions")
+
+    def __init__(self, keys: tuple):
+        self.keys = keys
+        self.index = {k: i for i, k in enumerate(keys)}
+        self.transitions = {}
+
+    def add(self, key: str) -> "Shape":
+        shape = self.transitions.get(key)
+        if shape is None:
+            shape = self.transitions[key] = Shape(self.keys + (sys.intern(key),))
+        return shape
+
+    def __reduce__(self):
+        # pickled (worker -> parent) as its keys and re-interned on arrival
+        return shape_for, (self.keys,)
+
+EMPTY_SHAPE = Shape(())
+
+def shape_for(keys) -> Shape:
+    shape = EMPTY_SHAPE
+    for k in keys:
+        shape = shape.add(k)
+    return shape
+
+class CompactAttributes(MutableMapping):
+    """
+    dict-compatible attribute map stored as (shared Shape, value tuple).
+    Key order is insertion order, exactly like the dict it replaces.
+    """
+    __slots__ = ("_shape", "_values")
+
+    def __init__(self, items=()):
+        self._shape = EMPTY_SHAPE
+        self._values = ()
+        for k, v in (items.items() if isinstance(items, (dict, CompactAttributes)) else items):
+            self[k] = v
+
+    def __getitem__(self, key):
+        i = self._shape.index.get(key)
+        if i is None:
+            raise KeyError(key)
+        return self._values[i]
+
+    def get(self, key, default=None):
+        i = self._shape.index.get(key)
+        return default if i is None else self._values[i]
+
+    def __contains__(self, key):
+        return key in self._shape.index
+
+    def __setitem__(self, key, value):
+        value = intern_value(value)
+        i = self._shape.index.get(key)
+        if i is None:
+            self._shape = self._shape.add(key)
+            self._values += (value,)
+        else:
+            self._values = self._values[:i] + (value,) + self._values[i + 1:]
+
+    def __delitem__(self, key):
+        i = self._shape.index[key]
+        self._shape = shape_for(self._shape.keys[:i] + self._shape.keys[i + 1:])
+        self._values = self._values[:i] + self._values[i + 1:]
+
+    def __iter__(self):
+        return iter(self._shape.keys)
+
+    def __len__(self):
+        return len(self._values)
+
+    def items(self):
+        return zip(self._shape.keys, self._values)
+
+    def to_dict(self) -> dict:
+        return dict(zip(self._shape.keys, self._values))
+
+    def __repr__(self):
+        return f"CompactAttributes({self.to_dict()!r})"
+
+# ---- Phone record ----
+PHONE_FIELDS = ("id", "brand", "model", "attributes")
+
+class PhoneRecord:
+    """
+    One merged phone; phone["attributes"] etc. work like on the JSON dict it replaces.
+    """
+    __slots__ = PHONE_FIELDS
+
+    def __init__(self, phone_id: str, brand: str, model: str, attributes=()):
+        self.id = phone_id
+        self.brand = sys.intern(brand)
+        self.model = model
+        self.attributes = attributes if isinstance(attributes, CompactAttributes) else CompactAttributes(attributes)
+
+    def __getitem__(self, field: str):
+        if field not in PHONE_FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __setitem__(self, field: str, value):
+        if field not in PHONE_FIELDS:
+            raise KeyError(field)
+        setattr(self, field, value)
+
+    def get(self, field: str, default=None):
+        return getattr(self, field) if field in PHONE_FIELDS else default
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "brand": self.brand, "model": self.model, "attributes": self.attributes.to_dict()}
+
+    @classmethod
+    def from_dict(cls, phone: dict):
+        """
+        A phone object from the brand JSON; anything not in that exact shape is returned unchanged.
+        """
+        if tuple(phone) != PHONE_FIELDS or not isinstance(phone["attributes"], dict):
+            return phone
+        return cls(phone["id"], phone["brand"], phone["model"], phone["attributes"])
+
+    def __eq__(self, other):
+        if isinstance(other, (PhoneRecord, dict)):
+            return self.to_dict() == (other.to_dict() if isinstance(other, PhoneRecord) else other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"PhoneRecord({self.to_dict()!r})"
+
+def compact_phones(phones: dict) -> dict:
+    """
+    Convert a loaded brand's phones map (id -> phone dict) in place.
+    """
+    for phone_id, phone in phones.items():
+        record = PhoneRecord.from_dict(phone)
+        if isinstance(record, PhoneRecord) and record.id == phone_id:
+            record.id = phone_id  # share the map key's string
+        phones[phone_id] = record
+    return phones
+
+def to_json(obj):
+    """
+    json.dump(default=...) hook: records are written in the original dict shape.
+    """
+    if isinstance(obj, (PhoneRecord, CompactAttributes)):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,111 @@
+import time
+from contextlib import nullcontext
+from collections import defaultdict
+
+# Stage timers in summary order; everything else is a plain counter
+STAGES = ["read", "detect", "mapping", "convert", "merge", "persist"]
+
+class StageTimer:
+    __slots__ = ("metrics", "stage", "start")
+
+    def __init__(self, metrics: "RunMetrics", stage: str):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.seconds[self.stage] += time.perf_counter() - self.start
+        return False
+
+class RunMetrics:
+    """
+    Stage timers (`with metrics.timer("read"): ...`) and counters
+    (`metrics.add("fuzzy_lookups")`) for one run. begin()/end() bracket one scope
+    (a CSV file); end() returns that scope's numbers. Everything measured, inside
+    a scope or not, ends up in totals().
+    With enabled=False timers and counters cost next to nothing.
+    """
+    def __init__(self, enabled: bool = True):
+        self.reset(enabled)
+
+    def reset(self, enabled: bool = True):
+        """
+        Start a new run: clear every number and restart the run clock.
+        """
+        self.enabled = enabled
+        self.seconds = defaultdict(float)
+        self.counters = defaultdict(int)
+        self.total_seconds = defaultdict(float)
+        self.total_counters = defaultdict(int)
+        self._run_started = time.perf_counter()
+        self._started = None
+        self._extra_wall = 0.0
+
+    def timer(self, stage: str):
+        return StageTimer(self, stage) if self.enabled else nullcontext()
+
+    def add(self, name: str, n: int = 1):
+        if self.enabled:
+            self.counters[name] += n
+
+    def absorb(self, snapshot: dict):
+        """
+        Add a scope measured elsewhere (a worker's end() result) to the current scope.
+        """
+        if not self.enabled or not snapshot:
+            return
+        for stage, s in snapshot["seconds"].items():
+            self.seconds[stage] += s
+        for name, n in snapshot["counters"].items():
+            self.counters[name] += n
+        self._extra_wall += snapshot["wall"]
+
+    def _fold(self):
+        for stage, s in self.seconds.items():
+            self.total_seconds[stage] += s
+        for name, n in self.counters.items():
+            self.total_counters[name] += n
+        self.seconds.clear()
+        self.counters.clear()
+
+    def begin(self):
+        self._fold()  # numbers taken outside any scope still count in the totals
+        self._started = time.perf_counter()
+        self._extra_wall = 0.0
+
+    def end(self, keep: bool = True) -> dict:
+        """
+        Close the current scope and return {"seconds", "counters", "wall"}.
+        keep=False leaves it out of this process's totals (a worker hands it to the parent).
+        """
+        wall = time.perf_counter() - self._started if self._started is not None else 0.0
+        snapshot = {"seconds": dict(self.seconds), "counters": dict(self.counters),
+                    "wall": wall + self._extra_wall}
+        if keep:
+            self._fold()
+        else:
+            self.seconds.clear()
+            self.counters.clear()
+        self._started = None
+        return snapshot
+
+    def totals(self) -> dict:
+        self._fold()
+        return {"seconds": dict(self.total_seconds), "counters": dict(self.total_counters),
+                "wall": time.perf_counter() - self._run_started}
+
+def format_metrics(snapshot: dict) -> str:
+    """
+    'rows=1200 (8000 rows/s), read=0.010s, ..., fuzzy_lookups=3, bytes_written=52311'
+    """
+    seconds, counters, wall = snapshot["seconds"], snapshot["counters"], snapshot["wall"]
+    parts = []
+    if "rows" in counters:
+        rate = f" ({counters['rows'] / wall:.0f} rows/s)" if wall > 0 else ""
+        parts.append(f"rows={counters['rows']}{rate}")
+    parts += [f"{stage}={seconds[stage]:.3f}s" for stage in STAGES if stage in seconds]
+    parts += [f"{name}={n}" for name, n in counters.items() if name != "rows"]
+    return ", ".join(parts)
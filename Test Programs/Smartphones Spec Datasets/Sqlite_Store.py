@@ -0,0 +1,215 @@
+import os
+import json
+import sqlite3
+from contextlib import nullcontext
+from collections.abc import MutableMapping
+
+from Phone_Record import PhoneRecord
+
+# === CONFIG ===
+SQLITE_DB = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Kaggle_Dataset_JSON\Store\phones.sqlite"
+BATCH_PHONES = 5000   # phones held in memory before they are written in one transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS brands (
+    file_key TEXT PRIMARY KEY,      -- brand file stem: spellings that share a JSON file share a key
+    brand    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS phones (
+    num      INTEGER PRIMARY KEY AUTOINCREMENT,   -- insertion order (JSON key order)
+    file_key TEXT NOT NULL REFERENCES brands(file_key),
+    id       TEXT NOT NULL,
+    brand    TEXT NOT NULL,
+    model    TEXT NOT NULL,
+    UNIQUE (file_key, id)
+);
+CREATE TABLE IF NOT EXISTS attributes (
+    phone INTEGER NOT NULL REFERENCES phones(num),
+    pos   INTEGER NOT NULL,                       -- attribute key order
+    key   TEXT NOT NULL,
+    value TEXT NOT NULL,                          -- JSON (number, string or list)
+    PRIMARY KEY (phone, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS phones_id ON phones(id);
+CREATE INDEX IF NOT EXISTS phones_brand ON phones(brand COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS phones_model ON phones(model COLLATE NOCASE);
+"""
+
+def encode_value(v) -> str:
+    return json.dumps(v, ensure_ascii=False, separators=(",", ":"))
+
+class SqlitePhones(MutableMapping):
+    """
+    One brand's phones map (id -> PhoneRecord) backed by the database. Records are
+    read on first access and stay in the store's pending batch, so in-place merges
+    (merge_phone / merge_attributes) are written back on the next flush.
+    """
+    __slots__ = ("store", "key")
+
+    def __init__(self, store: "SqliteBrandStore", key: str):
+        self.store = store
+        self.key = key
+
+    def __getitem__(self, phone_id):
+        record = self.store._load(self.key, phone_id)
+        if record is None:
+            raise KeyError(phone_id)
+        return record
+
+    def __contains__(self, phone_id):
+        return self.store._load(self.key, phone_id) is not None
+
+    def __setitem__(self, phone_id, record):
+        self.store._put(self.key, phone_id, record)
+
+    def __delitem__(self, phone_id):
+        if not self.store._delete(self.key, phone_id):
+            raise KeyError(phone_id)
+
+    def __iter__(self):
+        return iter(self.store._ids(self.key))
+
+    def __len__(self):
+        return len(self.store._ids(self.key))
+
+class SqliteBrandStore:
+    """
+    BrandStore with the same interface (get / mark_dirty / row_merged / flush)
+    on top of SQLite, for catalogs that don't fit in memory: only the phones
+    touched since the last flush are held, and each flush writes them in one
+    transaction (phones upserted, their attribute rows replaced). Merge semantics
+    stay in merge_attributes, which runs on the loaded record exactly as before.
+    `key` maps a brand name to its brand file stem (see brand_file_path);
+    flushes run inside timer("persist") when a stage timer is given.
+    """
+
+    def __init__(self, path: str = SQLITE_DB, key=None, batch_phones: int = BATCH_PHONES, timer=None):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.key = key or (lambda brand: brand.strip())
+        self.batch_phones = batch_phones
+        self.timer = timer or (lambda stage: nullcontext())
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._names = {}       # file key -> first brand spelling seen (stored for a new brand)
+        self._pending = {}     # (file key, id) -> [num or None if new, PhoneRecord]
+        self._missing = set()  # (file key, id) known not to exist (saves a second lookup on insert)
+        self._deleted = set()  # nums of phones removed since the last flush
+
+    # ---- BrandStore interface ----
+    def get(self, brand: str) -> dict:
+        key = self.key(brand)
+        self._names.setdefault(key, brand)
+        return {"brand": brand, "phones": SqlitePhones(self, key)}
+
+    def mark_dirty(self, brand: str, new_phones: int = 0):
+        pass  # every loaded record is written back on flush
+
+    def row_merged(self):
+        if len(self._pending) >= self.batch_phones:
+            self.flush()
+
+    def flush(self, evict: bool = False) -> int:
+        """
+        Write the pending batch in one transaction. Returns the number of brands touched.
+        """
+        if not self._pending and not self._deleted:
+            return 0
+        brands = {key for key, _ in self._pending}
+        with self.timer("persist"), self.conn:
+            if self._deleted:
+                nums = [(num,) for num in self._deleted]
+                self.conn.executemany("DELETE FROM attributes WHERE phone = ?", nums)
+                self.conn.executemany("DELETE FROM phones WHERE num = ?", nums)
+            self.conn.executemany("INSERT OR IGNORE INTO brands (file_key, brand) VALUES (?, ?)",
+                                  [(key, self._names[key]) for key in brands])
+            updated, attributes = [], []
+            for (key, phone_id), (num, record) in self._pending.items():
+                if num is None:
+                    num = self.conn.execute("INSERT INTO phones (file_key, id, brand, model) VALUES (?, ?, ?, ?)",
+                                            (key, phone_id, record.brand, record.model)).lastrowid
+                else:
+                    updated.append((record.brand, record.model, num))
+                attributes += [(num, pos, k, encode_value(v)) for pos, (k, v) in enumerate(record.attributes.items())]
+            self.conn.executemany("UPDATE phones SET brand = ?, model = ? WHERE num = ?", updated)
+            self.conn.executemany("DELETE FROM attributes WHERE phone = ?", [(num,) for _, _, num in updated])
+            self.conn.executemany("INSERT INTO attributes (phone, pos, key, value) VALUES (?, ?, ?, ?)", attributes)
+        self._pending.clear()
+        self._missing.clear()
+        self._deleted.clear()
+        return len(brands)
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    # ---- Records ----
+    def _read(self, num: int, phone_id: str, brand: str, model: str) -> PhoneRecord:
+        rows = self.conn.execute("SELECT key, value FROM attributes WHERE phone = ? ORDER BY pos", (num,))
+        return PhoneRecord(phone_id, brand, model, [(k, json.loads(v)) for k, v in rows])
+
+    def _load(self, key: str, phone_id: str) -> PhoneRecord | None:
+        entry = self._pending.get((key, phone_id))
+        if entry is not None:
+            return entry[1]
+        if (key, phone_id) in self._missing:
+            return None
+        row = self.conn.execute("SELECT num, brand, model FROM phones WHERE file_key = ? AND id = ?",
+                                (key, phone_id)).fetchone()
+        if row is None or row[0] in self._deleted:
+            self._missing.add((key, phone_id))
+            return None
+        record = self._read(row[0], phone_id, row[1], row[2])
+        self._pending[(key, phone_id)] = [row[0], record]
+        return record
+
+    def _put(self, key: str, phone_id: str, record: PhoneRecord):
+        if not isinstance(record, PhoneRecord):
+            record = PhoneRecord(record["id"], record["brand"], record["model"], record["attributes"])
+        entry = self._pending.get((key, phone_id))
+        if entry is None and self._load(key, phone_id) is None:
+            # new (or removed earlier in this batch): goes to the end, like a dict insert
+            self._pending[(key, phone_id)] = [None, record]
+            self._missing.discard((key, phone_id))
+        else:
+            self._pending[(key, phone_id)][1] = record
+
+    def _delete(self, key: str, phone_id: str) -> bool:
+        if self._load(key, phone_id) is None:
+            return False
+        num, _ = self._pending.pop((key, phone_id))
+        if num is not None:
+            self._deleted.add(num)
+        self._missing.add((key, phone_id))
+        return True
+
+    def _ids(self, key: str) -> list[str]:
+        self.flush()
+        return [pid for pid, in self.conn.execute("SELECT id FROM phones WHERE file_key = ? ORDER BY num", (key,))]
+
+    # ---- Export ----
+    def iter_brands(self):
+        """
+        Yield every brand db ({"brand", "phones": id -> PhoneRecord}) in the JSON
+        layout, one brand in memory at a time, in brand file order. Brands whose
+        phones were all removed come with an empty phones map.
+        """
+        self.flush()
+        for key, brand in self.conn.execute("SELECT file_key, brand FROM brands ORDER BY file_key").fetchall():
+            phones = {}
+            rows = self.conn.execute(
+                "SELECT p.id, p.brand, p.model, a.key, a.value FROM phones p "
+                "LEFT JOIN attributes a ON a.phone = p.num WHERE p.file_key = ? ORDER BY p.num, a.pos", (key,))
+            for phone_id, phone_brand, model, k, v in rows:
+                record = phones.get(phone_id)
+                if record is None:
+                    record = phones[phone_id] = PhoneRecord(phone_id, phone_brand, model)
+                if k is not None:
+                    record.attributes[k] = json.loads(v)
+            yield {"brand": brand, "phones": phones}
+
+    def iter_phones(self):
+        for db in self.iter_brands():
+            yield from db["phones"].values()
@@ -0,0 +1,154 @@
+import os
+import csv
+import random
+import argparse
+
+# === CONFIG ===
+OUTPUT_DIR = r"E:\BenchSmart\Test Programs\Smartphones Spec Datasets\Synthetic_Datasets"
+SEED = 42
+ROWS_PER_PHONE = 3      # on average every phone is listed this many times across the files
+NULL_RATE = 0.08        # share of spec cells left empty / 'NA'
+
+BRANDS = {
+    "Samsung": ["Galaxy S{n}", "Galaxy A{n}", "Galaxy M{n}", "Galaxy F{n}"],
+    "Xiaomi": ["Redmi Note {n}", "Redmi {n}", "Mi {n}"],
+    "Apple": ["iPhone {n}", "iPhone {n} Pro", "iPhone {n} Pro Max"],
+    "OnePlus": ["Nord {n}", "{n} Pro", "Nord CE {n}"],
+    "Realme": ["Narzo {n}", "{n} Pro", "C{n}"],
+    "Vivo": ["Y{n}", "V{n}", "T{n}"],
+    "Oppo": ["A{n}", "Reno {n}", "F{n}"],
+    "Motorola": ["Moto G{n}", "Edge {n}", "Moto E{n}"],
+    "Nokia": ["G{n}", "C{n}", "X{n}"],
+    "Google": ["Pixel {n}", "Pixel {n}a"],
+    "Poco": ["X{n}", "M{n}", "F{n}"],
+    "Infinix": ["Hot {n}", "Note {n}", "Zero {n}"],
+}
+SUFFIXES = ["", "", "", " 5G", " Lite", " Plus", " Neo"]
+OS_NAMES = ["Android", "android", "Android 13", "iOS", "iOS 17"]
+CHIPSETS = ["Snapdragon 695", "Snapdragon 8 Gen 2", "Dimensity 700", "Dimensity 8100",
+            "Helio G99", "Exynos 1380", "Tensor G3", "A16 Bionic", "Unisoc T606"]
+
+# ---- Phones ----
+def make_phone(rnd: random.Random) -> dict:
+    brand = rnd.choice(list(BRANDS))
+    model = rnd.choice(BRANDS[brand]).format(n=rnd.randint(1, 60)) + rnd.choice(SUFFIXES)
+    return {
+        "brand": brand,
+        "model": model,
+        "price": rnd.randrange(5999, 150000, 500) - 1,
+        "ram": rnd.choice([2, 3, 4, 6, 8, 12, 16]),
+        "storage": rnd.choice([32, 64, 128, 256, 512, 1024]),
+        "battery": rnd.randrange(3000, 6100, 100),
+        "display": round(rnd.uniform(5.5, 6.9), 2),
+        "refresh": rnd.choice([60, 90, 120, 144]),
+        "charging": rnd.choice([10, 18, 25, 33, 45, 67, 80, 120]),
+        "os": "iOS" if brand == "Apple" else rnd.choice(OS_NAMES[:3]),
+        "chipset": rnd.choice(CHIPSETS),
+        "rating": round(rnd.uniform(3.0, 4.9), 1),
+    }
+
+def storage_text(gb: int) -> str:
+    return "1 TB" if gb == 1024 else f"{gb} GB"
+
+# ---- Schemas (modelled on the Kaggle files) ----
+# Each schema: header -> function(phone, rnd) -> cell text
+SCHEMAS = {
+    # smartphones_cleaned_v6 style: clean snake_case, plain numbers
+    "cleaned": {
+        "brand_name": lambda p, r: p["brand"].lower(),
+        "model": lambda p, r: f"{p['brand']} {p['model']}",
+        "price": lambda p, r: str(p["price"]),
+        "rating": lambda p, r: str(p["rating"]),
+        "processor_name": lambda p, r: p["chipset"],
+        "ram_capacity": lambda p, r: str(p["ram"]),
+        "internal_memory": lambda p, r: str(p["storage"]),
+        "battery_capacity": lambda p, r: f"{p['battery']}.0",
+        "fast_charging": lambda p, r: f"{p['charging']}.0",
+        "screen_size": lambda p, r: str(p["display"]),
+        "refresh_rate": lambda p, r: str(p["refresh"]),
+        "os": lambda p, r: p["os"],
+    },
+    # 'smartphones - smartphones.csv' style: brand only inside the model, specs as prose
+    "marketplace": {
+        "model": lambda p, r: f"{p['brand']} {p['model']} ({p['ram']}GB RAM + {storage_text(p['storage'])})",
+        "price": lambda p, r: f"\u20b9{p['price']:,}",
+        "rating": lambda p, r: str(int(p["rating"] * 20)),
+        "processor": lambda p, r: f"{p['chipset']}, Octa Core",
+        "ram": lambda p, r: f"{p['ram']}\u2009GB RAM, {storage_text(p['storage'])} inbuilt",
+        "battery": lambda p, r: f"{p['battery']}\u2009mAh Battery with {p['charging']}W Fast Charging",
+        "display": lambda p, r: f"{p['display']} inches, 1080\u2009x\u20092400\u2009px, {p['refresh']} Hz Display",
+        "os": lambda p, r: f"{p['os']} v{r.randint(10, 14)}",
+    },
+    # flipkart style: brand/model split, display size in cm, discounted price
+    "flipkart": {
+        "Brand": lambda p, r: p["brand"].upper(),
+        "Model Name": lambda p, r: p["model"],
+        "discounted_price": lambda p, r: str(p["price"]),
+        "Original Price": lambda p, r: str(int(p["price"] * 1.2)),
+        "RAM": lambda p, r: f"{p['ram']}.0",
+        "storage": lambda p, r: f"{p['storage']}.0",
+        "display_size": lambda p, r: f"{p['display'] * 2.54:.2f}",
+        "battery_capacity": lambda p, r: str(p["battery"]),
+        "Avg Rating": lambda p, r: str(p["rating"]),
+    },
+    # hand-made exports: odd header spellings and units
+    "messy": {
+        "Manufacturer ": lambda p, r: p["brand"],
+        "Phone Model": lambda p, r: p["model"] + r.choice(["", " ", " (Dual SIM)"]),
+        "Price (INR)": lambda p, r: r.choice([f"Rs. {p['price']}", f"{p['price']:,}", f"\u20b9{p['price']:,} \u276f"]),
+        "RAM_GB": lambda p, r: r.choice([f"{p['ram']} GB", f"{p['ram']}GB", str(p["ram"])]),
+        "Storage GB": lambda p, r: storage_text(p["storage"]) + r.choice(["", " Storage"]),
+        "Battery mAh": lambda p, r: f"{p['battery']} mAh",
+        "Screen-Size": lambda p, r: f"{p['display']}\"",
+        "Refresh Rate": lambda p, r: f"{p['refresh']}Hz",
+        "Charging Watt": lambda p, r: f"{p['charging']}W",
+        "Operating System": lambda p, r: p["os"],
+        "Expandable": lambda p, r: r.choice(["microSDXC", " not expandable", "NA"]),
+    },
+}
+BRAND_MODEL_COLUMNS = {"brand_name", "model", "Brand", "Model Name", "Manufacturer ", "Phone Model"}
+NULLS = ["", "NA", "n/a", "null"]
+
+# ---- Writing ----
+def generate_csvs(total_rows: int, output_dir: str = OUTPUT_DIR, seed: int = SEED,
+                  files_per_schema: int = 2) -> list[str]:
+    """
+    Write `total_rows` rows spread over files of every schema. Phones repeat across
+    (and within) files about ROWS_PER_PHONE times each. Returns the CSV paths.
+    """
+    rnd = random.Random(seed)
+    os.makedirs(output_dir, exist_ok=True)
+    phones = [make_phone(rnd) for _ in range(max(1, total_rows // ROWS_PER_PHONE))]
+
+    names = [(schema, i) for schema in SCHEMAS for i in range(files_per_schema)]
+    paths = []
+    written = 0
+    for n, (schema, i) in enumerate(names):
+        rows = (total_rows - written) // (len(names) - n)
+        path = os.path.join(output_dir, f"synthetic_{schema}_{i + 1}.csv")
+        columns = SCHEMAS[schema]
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for _ in range(rows):
+                phone = rnd.choice(phones)
+                writer.writerow([
+                    rnd.choice(NULLS) if header not in BRAND_MODEL_COLUMNS and rnd.random() < NULL_RATE
+                    else cell(phone, rnd)
+                    for header, cell in columns.items()
+                ])
+        written += rows
+        paths.append(path)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic smartphone CSVs shaped like the Kaggle datasets.")
+    parser.add_argument("rows", type=int, help="total number of rows over all files")
+    parser.add_argument("--out", default=OUTPUT_DIR, help="output directory")
+    parser.add_argument("--seed", type=int, default=SEED)
+    args = parser.parse_args()
+    paths = generate_csvs(args.rows, args.out, args.seed)
+    print(f"{args.rows} rows written to {len(paths)} CSVs in: {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import re
+import json
+import hashlib
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+# ---- Rules per canonical key ----
+# pattern: number + unit searched anywhere in the text ('5000 mAh Battery with 33W ...' -> 5000 mAh)
+# units:   unit spelling -> factor to the canonical unit
+# bare:    a cell that is only a number is taken in the canonical unit
+# cm_range (display_size only): bare numbers in this range are centimetres, but only in a column
+#          whose header mentions cm or whose median bare number is in the range (Flipkart lists
+#          16.76 etc.); a 10.1" tablet in an inch column stays 10.1
+# round:   decimals kept after unit conversion
+# keep_text: words kept as text instead of being dropped (see python_values)
+# unit_key: attribute that gets each cell's own unit next to its value (see unit_values);
+#          price is not converted between currencies, so "$799" is 799 with price_currency "USD"
+NUMBER = r"(?P<num>\d+(?:\.\d+)?)"
+
+RULES = {
+    "price": {
+        "pattern": r"(?P<unit>₹|rs\.?|inr|\$|usd|€|eur)\s*" + NUMBER,
+        "units": {"₹": ("INR", 1), "rs": ("INR", 1), "rs.": ("INR", 1), "inr": ("INR", 1),
+                  "$": ("USD", 1), "usd": ("USD", 1), "€": ("EUR", 1), "eur": ("EUR", 1)},
+        "canonical": "INR",   # bare prices: every source so far is an Indian marketplace
+        "unit_key": "price_currency",
+    },
+    "ram": {
+        "pattern": NUMBER + r"\s*(?P<unit>tb|gb|mb)\b",
+        "units": {"mb": ("GB", 1 / 1024), "gb": ("GB", 1), "tb": ("GB", 1024)},
+        "canonical": "GB",
+    },
+    "storage": {
+        "pattern": NUMBER + r"\s*(?P<unit>tb|gb|mb)\b",
+        "units": {"mb": ("GB", 1 / 1024), "gb": ("GB", 1), "tb": ("GB", 1024)},
+        "canonical": "GB",
+    },
+    "battery_capacity": {
+        "pattern": NUMBER + r"\s*(?P<unit>mah)\b",
+        "units": {"mah": ("mAh", 1)},
+        "canonical": "mAh",
+    },
+    "display_size": {
+        "pattern": NUMBER + r"\s*(?P<unit>inches|inch|in\b|\"|cm)",
+        "units": {"inches": ("inch", 1), "inch": ("inch", 1), "in": ("inch", 1), '"': ("inch", 1),
+                  "cm": ("inch", 1 / 2.54)},
+        "canonical": "inch",
+        "cm_range": (10.0, 40.0),
+        "round": 2,
+    },
+    "refresh_rate": {
+        "pattern": NUMBER + r"\s*(?P<unit>hz)\b",
+        "units": {"hz": ("Hz", 1)},
+        "canonical": "Hz",
+    },
+    "charging": {
+        "pattern": NUMBER + r"\s*(?P<unit>watts?|w)\b",
+        "units": {"w": ("W", 1), "watt": ("W", 1), "watts": ("W", 1)},
+        "canonical": "W",
+        "keep_text": {"yes", "no"},   # has_fast_charging style flags
+    },
+}
+
+BARE_NUMBER = re.compile(r"\s*" + NUMBER + r"\s*")
+THOUSANDS_SEP = re.compile(r"(?<=\d),(?=\d)")
+SPACES = re.compile(r"[\u2009\u00a0\u202f]")   # thin / no-break spaces used by some listings
+CM_HEADER = re.compile(r"\bcm\b|centimet", re.IGNORECASE)
+COMPILED = {key: re.compile(rule["pattern"], re.IGNORECASE) for key, rule in RULES.items()}
+
+NORMALIZED_KEYS = set(RULES)
+
+def rules_fingerprint() -> str:
+    """
+    Changes whenever RULES change (cached merge results must then be rebuilt).
+    """
+    # sets (keep_text) are sorted: their str() order changes with hash randomization
+    text = json.dumps(RULES, sort_keys=True, default=lambda v: sorted(v) if isinstance(v, (set, frozenset)) else str(v))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+# ---- Column normalization ----
+def normalize_column(key: str, col: pd.Series) -> pd.DataFrame:
+    """
+    Parse a whole column for one canonical key; returns a frame aligned with `col`:
+      value    float64 in the canonical unit (NaN if the cell has no usable number)
+      unit     canonical unit (currency for price) or None
+      integral True where the source number was whole and stays whole after conversion
+    """
+    rule = RULES[key]
+    index = col.index
+    if pd.api.types.is_numeric_dtype(col) and not pd.api.types.is_bool_dtype(col):
+        value = col.astype(float).to_numpy(copy=True)
+        integral = pd.api.types.is_integer_dtype(col) & ~np.isnan(value)
+        unit = np.where(np.isnan(value), None, rule["canonical"]).astype(object)
+        return _apply_cm_range(rule, pd.DataFrame({"value": value, "unit": unit, "integral": integral}, index=index),
+                               bare=~np.isnan(value), header=col.name)
+
+    text = col.astype(str).str.replace(SPACES, " ", regex=True).str.replace(THOUSANDS_SEP, "", regex=True)
+    text = text.where(col.notna())
+
+    found = text.str.extract(COMPILED[key])
+    num = found["num"]
+    unit_token = found["unit"].str.lower()
+
+    # cells without a unit are accepted only when they are just a number
+    bare = num.isna() & text.str.fullmatch(BARE_NUMBER, na=False).astype(bool)
+    num = num.where(~bare, text.str.extract(BARE_NUMBER)["num"])
+
+    factor = unit_token.map({u: f for u, (_, f) in rule["units"].items()}).fillna(1.0)
+    unit = unit_token.map({u: name for u, (name, _) in rule["units"].items()}).fillna(rule["canonical"])
+
+    value = num.astype(float) * factor.astype(float)
+    if "round" in rule:
+        value = value.round(rule["round"])
+    integral = num.notna() & ~num.str.contains(".", regex=False, na=True).astype(bool)
+    integral &= (value % 1 == 0)
+    unit = unit.where(num.notna(), None)
+    frame = pd.DataFrame({"value": value.to_numpy(), "unit": unit.to_numpy(dtype=object),
+                          "integral": integral.to_numpy(dtype=bool)}, index=index)
+    return _apply_cm_range(rule, frame, bare=bare.to_numpy(), header=col.name)
+
+def _apply_cm_range(rule: dict, frame: pd.DataFrame, bare: np.ndarray, header=None) -> pd.DataFrame:
+    """
+    Bare numbers are centimetres for a whole column or not at all (see cm_range).
+    """
+    if "cm_range" not in rule:
+        return frame
+    lo, hi = rule["cm_range"]
+    value = frame["value"].to_numpy()
+    bare = bare & ~np.isnan(value)
+    if not bare.any():
+        return frame
+    if not (CM_HEADER.search(str(header or "")) or lo <= np.median(value[bare]) <= hi):
+        return frame
+    in_cm = bare & (value >= lo) & (value <= hi)
+    if in_cm.any():
+        frame.loc[in_cm, "value"] = np.round(value[in_cm] / 2.54, 2)
+        frame.loc[in_cm, "integral"] = False
+    return frame
+
+def python_values(frame: pd.DataFrame, key: str | None = None, col: pd.Series | None = None) -> list:
+    """
+    normalize_column() values as plain Python numbers (int when integral, None when
+    missing). With `key`/`col`, unparsed cells in the key's keep_text stay as text.
+    """
+    keep_text = RULES[key].get("keep_text", ()) if key else ()
+    raw = col.tolist() if keep_text else repeat(None)
+    out = []
+    for v, whole, cell in zip(frame["value"].tolist(), frame["integral"].tolist(), raw):
+        if v == v:
+            out.append(int(v) if whole else v)
+        elif isinstance(cell, str) and cell.strip().lower() in keep_text:
+            out.append(cell)
+        else:
+            out.append(None)
+    return out
+
+def unit_values(frame: pd.DataFrame, values: list) -> list:
+    """
+    Per-cell unit of normalize_column() for the numbers among python_values()
+    (None for missing cells and kept text).
+    """
+    return [u if isinstance(v, (int, float)) else None for u, v in zip(frame["unit"].tolist(), values)]
@@ -0,0 +1,39 @@
+import uuid
+
+import pytest
+
+from Entity_Resolution import resolve_entities
+
+def phone(brand: str, model: str) -> dict:
+    return {"id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"{brand}|{model}".lower())), "brand": brand, "model": model}
+
+# Different handsets from the bundled catalog that differ only in a qualifier
+MUST_NOT_MERGE = [
+    ("Alcatel", "Pixi 4 (4)", "Pixi 4 (3.5)"),
+    ("Alcatel", "Pixi 4 (6)", "Pixi 4 (3.5)"),
+    ("Alcatel", "Pixi 4 (4)", "Pixi 4 (6)"),
+    ("Alcatel", "OneTouch Pop 2 (4.5)", "OneTouch POP 2 (5)"),
+    ("Alcatel", "POP Star (4G)", "POP Star (3G)"),
+    ("AGM", "A9 4/64GB", "A9 4/32GB"),
+    ("Samsung", "Galaxy A5 (2016)", "Galaxy A5 (2017)"),
+    ("Alcatel", "IDOL 3 (4.7\")", "IDOL 3 (5.5\")"),
+]
+
+# Listings of one handset
+MUST_MERGE = [
+    ("Samsung", "Galaxy S21 5G (8GB RAM, 128GB)", "Galaxy S21"),
+    ("Xiaomi", "Redmi Note 8 (4GB RAM, 64GB)", "Redmi Note 8"),
+    ("Alcatel", "Pixi 4 (4)", "Pixi 4 (4\")"),
+    ("AGM", "A9 4/64GB", "A9 4/64 GB"),
+]
+
+@pytest.mark.parametrize("brand, a, b", MUST_NOT_MERGE)
+def test_qualified_models_stay_apart(brand, a, b):
+    assert resolve_entities([phone(brand, a), phone(brand, b)]) == {}
+
+@pytest.mark.parametrize("brand, a, b", MUST_MERGE)
+def test_listings_of_one_model_merge(brand, a, b):
+    first, second = phone(brand, a), phone(brand, b)
+    assert resolve_entities([first, second]) == {second["id"]: {
+        "id": first["id"], "brand": brand, "model": a, "alias_brand": brand, "alias_model": b,
+    }}